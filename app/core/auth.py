@@ -2,6 +2,7 @@
 Authentication and dependency injection utilities
 """
 
+import hmac
 from fastapi import HTTPException, Depends, Request, Header, status
 from typing import Optional, Annotated
 import structlog
@@ -9,56 +10,69 @@ from app.config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Snapshot of the configured API key; settings are fixed for the process lifetime
+_API_KEY = settings.api_key
+_AUTH_REQUIRED = bool(_API_KEY)
 
-async def verify_api_key_if_configured(
+# 401 details; each raise builds its own exception so concurrent requests
+# never share a traceback or exception context
+_BEARER_HEADERS = {"WWW-Authenticate": "Bearer"}
+_MISSING_HEADER_DETAIL = "Not authenticated. Authorization header is missing."
+_INVALID_SCHEME_DETAIL = "Invalid authentication scheme. Use Bearer token."
+_MALFORMED_HEADER_DETAIL = "Malformed Authorization header. Expected 'Bearer <token>'."
+_INVALID_KEY_DETAIL = "Invalid API key."
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers=_BEARER_HEADERS,
+    )
+
+
+async def allow_unauthenticated():
+    """
+    No API key configured: allow access without inspecting the request
+    """
+    return None  # No user/credentials to return, access is granted
+
+
+async def verify_api_key(
     request: Request,  # For logging context
     authorization: Annotated[Optional[str], Header()] = None  # Explicitly get Authorization header
 ):
     """
-    Verify API key if configured, otherwise allow access
+    Verify the Bearer API key against the configured key
     """
-    if settings.api_key:  # API key is configured, authentication is REQUIRED
-        if not authorization:
-            logger.warning("API key required, but no Authorization header provided.", url=str(request.url))
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Not authenticated. Authorization header is missing.",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        try:
-            scheme, credentials = authorization.split()
-            if scheme.lower() != "bearer":
-                logger.warning(f"Invalid authentication scheme: {scheme}. Expected Bearer.", url=str(request.url))
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid authentication scheme. Use Bearer token.",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-            if credentials != settings.api_key:
-                logger.warning("Invalid API key provided.", url=str(request.url))
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid API key.",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-        except ValueError:  # Handles case where split() fails (e.g., header doesn't have a space)
-            logger.warning("Malformed Authorization header. Expected 'Bearer <token>'.", url=str(request.url))
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Malformed Authorization header. Expected 'Bearer <token>'.",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        logger.debug("API key authentication successful.", url=str(request.url), user_provided_scheme=scheme)
-        return credentials  # Or a user object if you map keys to users
-    else:
-        # API key is not configured, allow unauthenticated access
-        logger.debug("API key not configured. Allowing unauthenticated access.", url=str(request.url))
-        if authorization:  # Log if auth was sent anyway but not checked
-            logger.info("Authorization header present but API key not configured; access allowed.", url=str(request.url))
-        return None  # No user/credentials to return, access is granted
+    if not authorization:
+        logger.warning("API key required, but no Authorization header provided.", url=request.url.path)
+        raise _unauthorized(_MISSING_HEADER_DETAIL)
+
+    if authorization[:7].lower() != "bearer ":
+        if " " not in authorization:
+            logger.warning("Malformed Authorization header. Expected 'Bearer <token>'.", url=request.url.path)
+            raise _unauthorized(_MALFORMED_HEADER_DETAIL)
+        scheme = authorization.split(" ", 1)[0]
+        logger.warning(f"Invalid authentication scheme: {scheme}. Expected Bearer.", url=request.url.path)
+        raise _unauthorized(_INVALID_SCHEME_DETAIL)
+
+    credentials = authorization[7:].strip()
+    if not credentials or " " in credentials:
+        logger.warning("Malformed Authorization header. Expected 'Bearer <token>'.", url=request.url.path)
+        raise _unauthorized(_MALFORMED_HEADER_DETAIL)
+
+    # Constant-time comparison to avoid leaking key contents via timing
+    if not hmac.compare_digest(credentials.encode(), _API_KEY.encode()):
+        logger.warning("Invalid API key provided.", url=request.url.path)
+        raise _unauthorized(_INVALID_KEY_DETAIL)
+    
+    logger.debug("API key authentication successful.", url=request.url.path, user_provided_scheme=authorization[:6])
+    return credentials  # Or a user object if you map keys to users
+
 
+# Pick the dependency once at startup instead of branching on every request
+verify_api_key_if_configured = verify_api_key if _AUTH_REQUIRED else allow_unauthenticated
 
 # This single dependency will be used by routes that need conditional auth
 AUTH_DEPENDENCY = Depends(verify_api_key_if_configured)
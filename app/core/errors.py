@@ -0,0 +1,45 @@
+"""
+Route error handling for Gateway Manager
+"""
+
+import functools
+from typing import Any, Awaitable, Callable, Optional, Sequence, TypeVar
+from fastapi import HTTPException, status
+import structlog
+
+Handler = TypeVar("Handler", bound=Callable[..., Awaitable[Any]])
+
+
+def route_errors(detail: str, log_message: Optional[str] = None, *,
+                 log_params: Sequence[str] = (), exc_info: bool = False) -> Callable[[Handler], Handler]:
+    """
+    Turn unexpected exceptions from a route handler into a logged 500 response.
+
+    HTTPExceptions raised by the handler pass through unchanged. The error is
+    logged as log_message (defaults to detail) on the handler module's logger,
+    with the handler arguments named in log_params.
+    """
+    def decorator(handler: Handler) -> Handler:
+        logger = structlog.get_logger(handler.__module__)
+        message = log_message or detail
+
+        # functools.wraps keeps the signature FastAPI inspects for parameters
+        @functools.wraps(handler)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await handler(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as e:
+                context = {name: kwargs.get(name) for name in log_params}
+                if exc_info:
+                    context["exc_info"] = True
+                logger.error(message, error=str(e), **context)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=detail
+                )
+
+        return wrapper
+
+    return decorator
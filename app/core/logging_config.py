@@ -2,15 +2,64 @@
 Logging configuration for the gateway manager
 """
 
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+import orjson
 import structlog
 from app.config import settings
 
 
+class _NamedBytesLogger(structlog.BytesLogger):
+    """BytesLogger writing to stderr that keeps its name for add_logger_name"""
+    
+    def __init__(self, name=None):
+        super().__init__(sys.stderr.buffer)
+        self.name = name
+
+
+# Drains stdlib log records to stderr on a background thread
+_log_listener: Optional[QueueListener] = None
+
+
+def _install_queue_logging(level: int) -> None:
+    """Make the root logger enqueue records; a listener thread does the writes"""
+    global _log_listener
+    stop_logging()
+    
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(level)
+    
+    _log_listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _log_listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued log records and write any later ones directly"""
+    global _log_listener
+    if _log_listener is None:
+        return
+    _log_listener.stop()
+    logging.getLogger().handlers = list(_log_listener.handlers)
+    _log_listener = None
+
+
 def setup_logging():
     """Configure structured logging"""
+    # The root logger handles third-party stdlib logging (and console-mode structlog)
+    level = logging.getLevelName(settings.log_level.upper())
+    _install_queue_logging(level)
+    
+    json_logs = settings.log_format == "json"
     structlog.configure(
         processors=[
-            structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
@@ -18,10 +67,15 @@ def setup_logging():
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer() if settings.log_format == "json" else structlog.dev.ConsoleRenderer()
+            structlog.processors.JSONRenderer(serializer=orjson.dumps) if json_logs else structlog.dev.ConsoleRenderer()
         ],
         context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
+        # JSON lines are written as orjson bytes straight to stderr, bypassing the
+        # stdlib handler chain; console output still goes through stdlib logging
+        logger_factory=_NamedBytesLogger if json_logs else structlog.stdlib.LoggerFactory(),
+        # Calls below the configured level return immediately, before any
+        # event dict is built or processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         cache_logger_on_first_use=True,
     )
 
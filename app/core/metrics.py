@@ -7,7 +7,12 @@ from prometheus_client import Counter, Histogram, Gauge
 
 # Prometheus metrics
 REQUEST_COUNT = Counter('api_requests_total', 'Total API requests', ['method', 'endpoint', 'status'])
-REQUEST_DURATION = Histogram('api_request_duration_seconds', 'API request duration')
+# Explicit buckets sized to gateway latencies; kept a Histogram so instances aggregate
+REQUEST_DURATION = Histogram(
+    'api_request_duration_seconds',
+    'API request duration',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+)
 ACTIVE_TASKS = Gauge('active_tasks_total', 'Number of active tasks')
 PENDING_TASKS = Gauge('pending_tasks_total', 'Number of pending tasks')
 COMPLETED_TASKS = Counter('completed_tasks_total', 'Total completed tasks', ['status'])
@@ -10,21 +10,22 @@ This file is focused only on:
 All business logic is in services/ and routes/
 """
 
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from contextlib import asynccontextmanager
+from fastapi.responses import ORJSONResponse
+from contextlib import AsyncExitStack, asynccontextmanager
 from prometheus_client import start_http_server
-import logging
-import time
+import asyncio
 
 from app.config import settings
-from app.core.logging_config import setup_logging, get_logger
+from app.core.logging_config import setup_logging, stop_logging, get_logger
 from app.core.auth import AUTH_DEPENDENCY
+from app.core.middleware_factory import setup_middleware_stack
 from app.routes import tasks, cluster, health
 from app.model_routes import model_router
 from app.services.model_service import ModelManagementService
 from app.services.service_proxy import service_proxy
+from app.services.request_log_queue import RequestLogQueue
 
 # Database models and services
 from app.models.database import DatabaseManager
@@ -42,64 +43,90 @@ from app.routes.integrated_system import integrated_system_router, api_health_ro
 # Admin management routes  
 from app.routes.admin import router as admin_router
 
-# Startup logging for API key configuration
-logging.basicConfig(level=logging.INFO) 
-startup_logger = logging.getLogger(f"{__name__}.startup_auth_check")
-startup_logger.info(f"Auth Check at Startup: settings.api_key = '{settings.api_key}' (type: {type(settings.api_key)})")
-if settings.api_key == "":
-    startup_logger.warning("Auth Check at Startup: settings.api_key is an empty string. Treating as NO API key.")
-
 logger = get_logger(__name__)
 
+# Routers and their include options, in registration order
+ROUTERS = (
+    # Health routes don't need auth
+    (health.router, {}),
+    
+    # Legacy protected routes (keep for backward compatibility)
+    (tasks.router, {}),
+    (cluster.router, {}),
+    (model_router, {"prefix": "/api/v1", "dependencies": [AUTH_DEPENDENCY]}),
+    
+    # New integrated routes (CLI-compatible)
+    (api_health_router, {}),          # /api/health (CLI compatibility)
+    (integrated_system_router, {}),   # System routes (no auth for ping/health)
+    (integrated_model_router, {}),    # /api/models/*
+    (integrated_task_router, {}),     # /api/tasks/*
+    (integrated_cluster_router, {}),  # /api/workers/*
+    
+    # Admin management routes (protected)
+    (admin_router, {}),               # /admin/* (management interface)
+)
+
+
+async def _cleanup(message: str, *cleanups) -> None:
+    """Run independent cleanup callables concurrently, then log"""
+    await asyncio.gather(*(cleanup() for cleanup in cleanups))
+    logger.info(message)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
     logger.info("Starting GPU Cluster API Gateway", version="1.0.0", api_key_configured=bool(settings.api_key))
-      # Initialize database manager (use global instance)
-    from app.models.database import db_manager
-    await db_manager.initialize()
-    app.state.db_manager = db_manager
-    logger.info("Database manager initialized")
-      # Initialize database models
-    app.state.api_request_service = APIRequestService(db_manager)
-    app.state.auth_service = AuthenticationService(db_manager)
-    app.state.rate_limit_service = RateLimitService(db_manager)
-    app.state.security_service = SecurityService(db_manager)
-    logger.info("Database models initialized")
-    
-    # Initialize model management service (legacy)
-    model_service = ModelManagementService()
-    await model_service.initialize()
-    app.state.model_service = model_service
-    logger.info("Model management service initialized")
     
-    # Initialize service proxy for integrated routes
-    app.state.service_proxy = service_proxy
-    logger.info("Service proxy initialized for integrated routing")
-    
-    if settings.enable_prometheus:
-        start_http_server(settings.prometheus_port)
-        logger.info(f"Prometheus metrics server started on port {settings.prometheus_port}")
-    
-    yield
-    
-    # Cleanup database models
-    if hasattr(app.state, 'db_manager'):
-        await app.state.db_manager.close()
-        logger.info("Database manager cleaned up")
-    
-    # Cleanup model service
-    if hasattr(app.state, 'model_service'):
-        await app.state.model_service.cleanup()
-        logger.info("Model management service cleaned up")
-    
-    # Cleanup service proxy
-    if hasattr(app.state, 'service_proxy'):
-        await app.state.service_proxy.cleanup()
-        logger.info("Service proxy cleaned up")
+    # Each resource registers its cleanup as soon as it exists; cleanups run in
+    # reverse order on shutdown, or if a later startup step fails
+    async with AsyncExitStack() as stack:
+        # Initialize database manager (use global instance)
+        from app.models.database import db_manager
+        await db_manager.initialize()
+        stack.push_async_callback(_cleanup, "Database manager cleaned up", db_manager.close)
+        app.state.db_manager = db_manager
+        logger.info("Database manager initialized")
+        
+        # Initialize database models
+        app.state.api_request_service = APIRequestService(db_manager)
+        app.state.auth_service = AuthenticationService(db_manager)
+        app.state.rate_limit_service = RateLimitService(db_manager)
+        app.state.security_service = SecurityService(db_manager)
+        logger.info("Database models initialized")
+        
+        # Persist request logs from a background consumer instead of the request path;
+        # drained before the database goes away
+        request_log_queue = RequestLogQueue(db_manager)
+        request_log_queue.start()
+        stack.push_async_callback(_cleanup, "Request log queue drained", request_log_queue.stop)
+        app.state.request_log_queue = request_log_queue
+        logger.info("Request log queue started")
+        
+        # Initialize model management service (legacy) and the service proxy for
+        # integrated routes; their HTTP clients are independent and close together
+        model_service = ModelManagementService()
+        stack.push_async_callback(
+            _cleanup,
+            "Model management service and service proxy cleaned up",
+            model_service.cleanup,
+            service_proxy.cleanup
+        )
+        await model_service.initialize()
+        app.state.model_service = model_service
+        logger.info("Model management service initialized")
+        
+        app.state.service_proxy = service_proxy
+        logger.info("Service proxy initialized for integrated routing")
+        
+        if settings.enable_prometheus:
+            start_http_server(settings.prometheus_port)
+            logger.info(f"Prometheus metrics server started on port {settings.prometheus_port}")
+        
+        yield
     
     logger.info("Shutting down GPU Cluster API Gateway")
+    stop_logging()
 
 
 def create_app() -> FastAPI:
@@ -112,22 +139,37 @@ def create_app() -> FastAPI:
         logger.info("API Authentication: ENABLED. Routes will be protected by 'verify_api_key_if_configured'.", api_key_configured=True)
     else:
         logger.info("API Authentication: DISABLED. 'verify_api_key_if_configured' will allow all requests.", api_key_configured=False)
+    # Independent of API_KEY: the gateway middleware checks database-issued keys
+    if settings.enable_gateway_middleware:
+        logger.info("Gateway middleware: ENABLED. Database API keys are required on /api/*, /admin/* and /manage/* except the public health and ping endpoints.")
+    else:
+        logger.info("Gateway middleware: DISABLED. Set ENABLE_GATEWAY_MIDDLEWARE=true for database API keys, rate limiting and request logging.")
 
     app_description = (
         "REST API for AMD GPU cluster task submission and management. "
         + ("API key authentication is ENABLED and REQUIRED if an API_KEY is set in the environment." if settings.api_key else "API key authentication is DISABLED (open access).")
+        + (" Database-issued API keys are required on /api/*, /admin/* and /manage/* routes other than the health and ping endpoints." if settings.enable_gateway_middleware else "")
     )
 
     app = FastAPI(
         title="BitingLip GPU Cluster API Gateway",
         description=app_description,
         version="1.0.0",
-        docs_url="/docs",
-        redoc_url="/redoc",
+        # Interactive docs are only served in debug mode
+        docs_url="/docs" if settings.debug else None,
+        redoc_url="/redoc" if settings.debug else None,
+        # Every included router inherits orjson encoding for its JSON responses; the
+        # integrated routes return proxied upstream JSON as ORJSONResponse directly,
+        # skipping FastAPI's jsonable_encoder pass
+        default_response_class=ORJSONResponse,
         lifespan=lifespan
     )
 
-    # Configure CORS
+    # Gateway middleware (opt-in); its services are created by the lifespan
+    if settings.enable_gateway_middleware:
+        setup_middleware_stack(app)
+
+    # Configure CORS (added last so it is outermost and answers preflights before auth)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],  # Configure as needed
@@ -136,144 +178,30 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Middleware will be added after database initialization via startup event    @app.on_event("startup")
-    async def setup_middleware():
-        """Setup middleware after database models are initialized"""
-        try:
-            # Get service instances from app state
-            api_request_service = app.state.api_request_service
-            auth_service = app.state.auth_service
-            rate_limit_service = app.state.rate_limit_service
-            security_service = app.state.security_service
-            
-            # Add our enhanced middleware stack (order matters!)
-            # Note: Using a simple request logging for now until middleware integration is fixed
-            app.middleware("http")(create_enhanced_logging_middleware(api_request_service))
-            
-            logger.info("Enhanced middleware stack initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize middleware: {e}")
-            # Fall back to basic logging
-            app.middleware("http")(basic_log_requests)
-
-    # Register routes (health routes don't need auth)
-    app.include_router(health.router)
-    
-    # Legacy protected routes (keep for backward compatibility)
-    app.include_router(tasks.router)
-    app.include_router(cluster.router)
-    app.include_router(
-        model_router, 
-        prefix="/api/v1",
-        dependencies=[AUTH_DEPENDENCY]
-    )
-      # New integrated routes (CLI-compatible)
-    app.include_router(api_health_router)         # /api/health (CLI compatibility)
-    app.include_router(integrated_system_router)  # System routes (no auth for ping/health)
-    app.include_router(integrated_model_router)   # /api/models/*
-    app.include_router(integrated_task_router)    # /api/tasks/*
-    app.include_router(integrated_cluster_router) # /api/workers/*
-    
-    # Admin management routes (protected)
-    app.include_router(admin_router)              # /admin/* (management interface)
+    # Register routes in one pass
+    for router, options in ROUTERS:
+        app.include_router(router, **options)
 
     return app
 
 
-def create_enhanced_logging_middleware(api_request_service):
-    """Create enhanced request logging middleware with database persistence"""
-    async def enhanced_log_requests(request: Request, call_next):
-        start_time = time.time()
-        
-        # Start request logging
-        request_id = None
-        try:
-            request_id = await api_request_service.start_request(
-                method=request.method,
-                path=request.url.path,
-                query_params=dict(request.query_params),
-                headers=dict(request.headers),
-                client_ip=request.client.host if request.client else "unknown"
-            )
-        except Exception as e:
-            logger.warning(f"Failed to start request logging: {e}")
-        
-        # Process request
-        try:
-            response = await call_next(request)
-            process_time = time.time() - start_time
-            
-            # Complete request logging
-            if request_id:
-                try:
-                    await api_request_service.complete_request(
-                        request_id=request_id,
-                        status_code=response.status_code,
-                        response_time_ms=int(process_time * 1000)
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to complete request logging: {e}")
-            
-            # Basic logging
-            logger.info(
-                "Request processed",
-                method=request.method,
-                url=str(request.url),
-                status_code=response.status_code,
-                process_time=process_time,
-                request_id=request_id
-            )
-            
-            return response
-            
-        except Exception as e:
-            process_time = time.time() - start_time
-            
-            # Log error
-            if request_id:
-                try:
-                    await api_request_service.complete_request(
-                        request_id=request_id,
-                        status_code=500,
-                        response_time_ms=int(process_time * 1000),
-                        error_message=str(e)
-                    )
-                except Exception as log_e:
-                    logger.warning(f"Failed to complete error request logging: {log_e}")
-            
-            logger.error(
-                "Request failed",
-                method=request.method,
-                url=str(request.url),
-                error=str(e),
-                process_time=process_time,
-                request_id=request_id
-            )
-            raise
-    
-    return enhanced_log_requests
-
-
-async def basic_log_requests(request: Request, call_next):
-    """Basic request logging middleware (fallback)"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    
-    logger.info(
-        "Request processed",
-        method=request.method,
-        url=str(request.url),
-        status_code=response.status_code,
-        process_time=process_time
-    )
-    return response
-
-
 # Create app instance
 app = create_app()
 
 
 if __name__ == "__main__":
+    import os
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    
+    # Import string so workers can be spawned; uvloop is unavailable on Windows
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8080,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=os.cpu_count(),
+        access_log=not settings.enable_gateway_middleware,  # the gateway middleware logs every request itself
+        log_config=None  # keep the handlers installed by setup_logging()
+    )
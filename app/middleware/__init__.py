@@ -6,10 +6,12 @@ from .logging_middleware import LoggingMiddleware
 from .auth_middleware import AuthenticationMiddleware
 from .rate_limit_middleware import RateLimitMiddleware
 from .security_middleware import SecurityMiddleware
+from .combined import GatewayMiddleware
 
 __all__ = [
     'LoggingMiddleware',
     'AuthenticationMiddleware', 
     'RateLimitMiddleware',
-    'SecurityMiddleware'
+    'SecurityMiddleware',
+    'GatewayMiddleware'
 ]
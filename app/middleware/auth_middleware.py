@@ -2,15 +2,48 @@
 Authentication middleware for Gateway Manager
 """
 
-from typing import Optional
+import hashlib
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
 from fastapi import Request, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 import structlog
 
 from app.models import AuthenticationService
+from .client_ip import get_client_ip
 
 logger = structlog.get_logger(__name__)
 
+# Validated API keys are trusted for this long before re-checking the database
+KEY_CACHE_TTL_SECONDS = 60.0
+KEY_CACHE_MAX_SIZE = 2048
+
+# Recently validated keys: (key digest, client IP) -> (expires_at, key_data). Shared by
+# the process so revoking a key can drop its entries
+_key_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+
+
+def invalidate_cached_api_key(key_id: str) -> None:
+    """Forget cached validations of an API key; call after revoking it"""
+    stale = [cache_key for cache_key, (_, key_data) in _key_cache.items()
+             if key_data.get('key_id') == key_id]
+    for cache_key in stale:
+        del _key_cache[cache_key]
+
+
+def _seconds_until_key_expiry(key_data: Dict[str, Any]) -> Optional[float]:
+    """Seconds until the key's own expires_at (None if it does not expire)"""
+    expires_at = key_data.get('expires_at')
+    if not expires_at:
+        return None
+    if isinstance(expires_at, str):
+        expires_at = datetime.fromisoformat(expires_at)
+    if expires_at.tzinfo is None:
+        # Key expiry times are stored as naive UTC
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return (expires_at - datetime.now(timezone.utc)).total_seconds()
+
 
 class AuthenticationMiddleware(BaseHTTPMiddleware):
     """Middleware for API key authentication"""
@@ -19,26 +52,40 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.auth_service = auth_service
         
-        # Paths that don't require authentication
-        self.public_paths = {
+        # Paths that don't require authentication (including the CLI's
+        # unauthenticated health and connectivity checks under /api)
+        self.public_paths = frozenset({
             "/health",
             "/metrics", 
             "/docs",
             "/openapi.json",
-            "/redoc"
-        }
-        
-        # Paths that require authentication
-        self.protected_prefixes = [
+            "/redoc",
+            "/api/health",
+            "/api/system/ping",
+            "/api/system/health"
+        })
+        
+        # Paths that require authentication (tuple for str.startswith)
+        self.protected_prefixes = (
             "/api/",
             "/admin/",
             "/manage/"
-        ]
+        )
+        
+        self._key_cache = _key_cache
+        self._key_cache_ttl = KEY_CACHE_TTL_SECONDS
+        self._key_cache_max_size = KEY_CACHE_MAX_SIZE
     
     async def dispatch(self, request: Request, call_next):
+        await self.authenticate(request)
+        return await call_next(request)
+    
+    async def authenticate(self, request: Request) -> None:
+        """Validate the request's API key and record the caller on request.state"""
         # Check if path requires authentication
-        if not self._requires_auth(request.url.path):
-            return await call_next(request)
+        path = request.url.path
+        if path in self.public_paths or not path.startswith(self.protected_prefixes):
+            return
         
         # Extract API key from request
         api_key = self._extract_api_key(request)
@@ -46,7 +93,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
         if not api_key:
             logger.warning("Missing API key",
                           path=request.url.path,
-                          client_ip=self._get_client_ip(request))
+                          client_ip=get_client_ip(request))
             
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -55,14 +102,10 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
             )
         
         # Validate API key
-        client_ip = self._get_client_ip(request)
+        client_ip = get_client_ip(request)
         user_agent = request.headers.get("user-agent")
         
-        key_data = await self.auth_service.validate_api_key(
-            api_key=api_key,
-            client_ip=client_ip,
-            user_agent=user_agent
-        )
+        key_data = await self._validate_api_key(api_key, client_ip, user_agent)
         
         if not key_data:
             logger.warning("Invalid API key",
@@ -88,22 +131,47 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                    key_id=key_data['key_id'],
                    path=request.url.path,
                    client_ip=client_ip)
-        
-        return await call_next(request)
     
-    def _requires_auth(self, path: str) -> bool:
-        """Check if path requires authentication"""
-        # Public paths don't require auth
-        if path in self.public_paths:
-            return False
-        
-        # Check protected prefixes
-        return any(path.startswith(prefix) for prefix in self.protected_prefixes)
+    async def _validate_api_key(self, api_key: str, client_ip: str,
+                                user_agent: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Validate an API key, serving recent successful validations from cache"""
+        # Digest the key so raw keys are never held in memory beyond the request
+        cache_key = (hashlib.blake2b(api_key.encode(), digest_size=16).hexdigest(), client_ip)
+        now = time.monotonic()
+        
+        cached = self._key_cache.get(cache_key)
+        if cached is not None:
+            if cached[0] > now:
+                return cached[1]
+            del self._key_cache[cache_key]
+        
+        key_data = await self.auth_service.validate_api_key(
+            api_key=api_key,
+            client_ip=client_ip,
+            user_agent=user_agent
+        )
+        
+        if key_data:
+            # Never trust the cached validation past the key's own expiry
+            ttl = self._key_cache_ttl
+            key_expiry = _seconds_until_key_expiry(key_data)
+            if key_expiry is not None:
+                ttl = min(ttl, key_expiry)
+            if ttl > 0:
+                self._key_cache.pop(cache_key, None)
+                if len(self._key_cache) >= self._key_cache_max_size:
+                    # Evict the oldest entry (dicts keep insertion order)
+                    del self._key_cache[next(iter(self._key_cache))]
+                self._key_cache[cache_key] = (now + ttl, key_data)
+        
+        return key_data
     
     def _extract_api_key(self, request: Request) -> Optional[str]:
         """Extract API key from request headers"""
+        headers = request.headers
+        
         # Check Authorization header
-        auth_header = request.headers.get("authorization")
+        auth_header = headers.get("authorization")
         if auth_header:
             if auth_header.startswith("Bearer "):
                 return auth_header[7:]  # Remove "Bearer " prefix
@@ -111,7 +179,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                 return auth_header[7:]  # Remove "ApiKey " prefix
         
         # Check X-API-Key header
-        api_key_header = request.headers.get("x-api-key")
+        api_key_header = headers.get("x-api-key")
         if api_key_header:
             return api_key_header
         
@@ -121,20 +189,3 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
             return api_key_param
         
         return None
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request"""
-        # Check for forwarded headers first
-        forwarded_for = request.headers.get("x-forwarded-for")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("x-real-ip")
-        if real_ip:
-            return real_ip
-        
-        # Fall back to direct client
-        if hasattr(request, 'client') and request.client:
-            return request.client.host
-        
-        return "unknown"
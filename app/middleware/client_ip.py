@@ -0,0 +1,36 @@
+"""
+Client IP resolution shared by the middleware
+"""
+
+from functools import lru_cache
+from fastapi import Request
+
+
+@lru_cache(maxsize=4096)
+def _first_forwarded_hop(forwarded_for: str) -> str:
+    """Return the original client from an X-Forwarded-For value (cached; proxies repeat values)"""
+    return forwarded_for.partition(",")[0].strip()
+
+
+def get_client_ip(request: Request) -> str:
+    """Extract client IP from request, parsing it once and caching it in the ASGI scope"""
+    scope = request.scope
+    client_ip = scope.get("client_ip")
+    if client_ip is not None:
+        return client_ip
+    
+    headers = request.headers
+    
+    # Check for forwarded headers first (first hop is the original client)
+    forwarded_for = headers.get("x-forwarded-for")
+    if forwarded_for:
+        client_ip = _first_forwarded_hop(forwarded_for)
+    else:
+        client_ip = headers.get("x-real-ip")
+        if not client_ip:
+            # Fall back to direct client
+            client = request.client
+            client_ip = client.host if client else "unknown"
+    
+    scope["client_ip"] = client_ip
+    return client_ip
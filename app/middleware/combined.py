@@ -0,0 +1,121 @@
+"""
+Combined gateway middleware for Gateway Manager
+
+Runs logging, authentication, rate limiting and security monitoring as a
+single pure-ASGI layer instead of four stacked middleware layers, sharing
+one Request wrapper and one send wrapper across the stages. The stage logic
+itself lives in the individual middleware classes.
+"""
+
+import time
+from typing import Any, Optional
+from fastapi import Request, HTTPException
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .logging_middleware import LoggingMiddleware, SKIP_LOGGING_PATHS
+from .auth_middleware import AuthenticationMiddleware
+from .rate_limit_middleware import RateLimitMiddleware
+from .security_middleware import SecurityMiddleware, EXEMPT_PATHS as SECURITY_EXEMPT_PATHS
+
+# Public probe endpoints (including the CLI health and ping checks): no stage applies
+PASSTHROUGH_PATHS = SECURITY_EXEMPT_PATHS | {"/api/health", "/api/system/ping", "/api/system/health"}
+
+
+class GatewayMiddleware:
+    """Pure ASGI middleware running logging -> auth -> rate limit -> security inline"""
+
+    # app.state attributes the stages are built from
+    REQUIRED_SERVICES = ('request_log_queue', 'auth_service', 'rate_limit_service', 'security_service')
+
+    def __init__(self, app: ASGIApp, services: Any):
+        self.app = app
+
+        # Usually app.state: the lifespan populates it after the middleware stack
+        # is built, so the stages are created on the first HTTP request
+        self.services = services
+        self._stages_ready = False
+
+    def _build_stages(self) -> None:
+        """Resolve the services and create the stage implementations"""
+        services = self.services
+        missing = [name for name in self.REQUIRED_SERVICES if not getattr(services, name, None)]
+        if missing:
+            raise RuntimeError(f"Services not initialized in app state: {', '.join(missing)}")
+
+        # Stage implementations; their own ASGI/dispatch entry points are never used here
+        self.logging = LoggingMiddleware(self.app, request_log_queue=services.request_log_queue)
+        self.auth = AuthenticationMiddleware(self.app, auth_service=services.auth_service)
+        self.rate_limit = RateLimitMiddleware(
+            self.app,
+            rate_limit_service=services.rate_limit_service,
+            security_service=services.security_service
+        )
+        self.security = SecurityMiddleware(self.app, security_service=services.security_service)
+        self._stages_ready = True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in PASSTHROUGH_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if not self._stages_ready:
+            self._build_stages()
+
+        # One Request wrapper shared by every stage; state lives in the scope
+        request = Request(scope, receive)
+
+        # Docs still pass the checks but are not logged or observed
+        if scope["path"] in SKIP_LOGGING_PATHS:
+            rejection = await self._run_request_checks(request, {})
+            await (rejection or self.app)(scope, receive, send)
+            return
+
+        start_ns = time.perf_counter_ns()
+        record = self.logging.start_request(request)
+
+        response_headers = {"X-Request-ID": record["request_id"]}
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                for name, value in response_headers.items():
+                    headers[name] = value
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            rejection = await self._run_request_checks(request, response_headers)
+            if rejection is not None:
+                await rejection(scope, receive, send_wrapper)
+            else:
+                await self.app(scope, receive, send_wrapper)
+                await self.security.check_response(request, status_code)
+        except Exception as e:
+            self.logging.finish_request(record, request, start_ns, 500, error=e)
+            raise
+
+        self.logging.finish_request(record, request, start_ns, status_code, response_size)
+
+    async def _run_request_checks(self, request: Request,
+                                  response_headers: dict) -> Optional[JSONResponse]:
+        """Run the pre-request stages; returns an error response if one rejects the request"""
+        try:
+            await self.auth.authenticate(request)
+            response_headers.update(await self.rate_limit.enforce(request))
+
+            request.state.start_ns = time.perf_counter_ns()
+            await self.security.check_request(request)
+        except HTTPException as e:
+            return JSONResponse(
+                {"detail": e.detail},
+                status_code=e.status_code,
+                headers=e.headers
+            )
+        return None
@@ -0,0 +1,77 @@
+"""
+Background security incident reporting for Gateway Manager middleware
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Set, Tuple
+import structlog
+
+from app.models import SecurityService
+
+logger = structlog.get_logger(__name__)
+
+
+class IncidentReporter:
+    """Writes security incidents from background tasks so requests never wait on them"""
+
+    def __init__(self, security_service: SecurityService, max_pending: int = 64,
+                 dedupe_window: float = 60.0, dedupe_max_size: int = 50_000):
+        self.security_service = security_service
+        self.max_pending = max_pending
+        self.dedupe_window = dedupe_window
+        self.dedupe_max_size = dedupe_max_size
+        # Strong references keep running tasks from being garbage collected
+        self._pending: Set[asyncio.Task] = set()
+        self._dropped = 0
+        # (source IP, incident type, detection) -> [window end, repeats suppressed in window]
+        self._recent: Dict[Tuple[Any, ...], List[Any]] = {}
+
+    def report(self, **incident: Any) -> None:
+        """
+        Schedule a create_incident call.
+
+        Repeats of the same detection from the same source within the dedupe window
+        are only counted; the next incident written for it carries the count as
+        details["suppressed_repeats"]. Incidents are dropped if too many writes
+        are in flight.
+        """
+        details = incident.get("details") or {}
+        key = (
+            incident.get("source_ip"),
+            incident.get("incident_type"),
+            details.get("attack_type") or details.get("error_type") or details.get("detection_type")
+        )
+        now = time.monotonic()
+        recent = self._recent.get(key)
+        if recent is not None and recent[0] > now:
+            recent[1] += 1
+            return
+
+        if recent is not None:
+            del self._recent[key]
+            if recent[1]:
+                incident["details"] = {**details, "suppressed_repeats": recent[1]}
+        elif len(self._recent) >= self.dedupe_max_size:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._recent[next(iter(self._recent))]
+        self._recent[key] = [now + self.dedupe_window, 0]
+
+        if len(self._pending) >= self.max_pending:
+            self._dropped += 1
+            if self._dropped % 1000 == 1:
+                logger.warning("Incident writes backed up, dropping incidents", dropped=self._dropped)
+            return
+
+        task = asyncio.create_task(self._create(incident))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _create(self, incident: Dict[str, Any]) -> None:
+        try:
+            await self.security_service.create_incident(**incident)
+        except Exception as e:
+            logger.error("Failed to create security incident",
+                        incident_type=incident.get("incident_type"),
+                        source_ip=incident.get("source_ip"),
+                        error=str(e))
@@ -2,165 +2,172 @@
 Logging middleware for Gateway Manager
 """
 
+import itertools
+import os
 import time
-import uuid
-from typing import Dict, Any
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
-from app.models import APIRequestService, APIRequest, get_db
+from app.services.request_log_queue import RequestLogQueue
+from .client_ip import get_client_ip
 
 logger = structlog.get_logger(__name__)
 
+# Request IDs: a per-process tag (PID + start time, so IDs stay unique across
+# restarts) followed by a counter; avoids an os.urandom call per request
+def _reset_request_ids() -> None:
+    global _REQ_SEQ, _PID_TAG
+    _REQ_SEQ = itertools.count()
+    _PID_TAG = f"{os.getpid():x}{int(time.time()):x}"
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging all API requests to database"""
+
+_reset_request_ids()
+if hasattr(os, "register_at_fork"):
+    # Workers forked from a preloaded master must not share the master's tag
+    os.register_at_fork(after_in_child=_reset_request_ids)
+
+
+def next_request_id() -> str:
+    """Return a request ID unique to this process"""
+    return f"req_{_PID_TAG}_{next(_REQ_SEQ):x}"
+
+
+# Probe and documentation endpoints that are passed through without logging
+SKIP_LOGGING_PATHS = frozenset({
+    "/health", "/metrics", "/docs", "/redoc", "/openapi.json",
+    "/api/health", "/api/system/ping", "/api/system/health"
+})
+
+
+class LoggingMiddleware:
+    """Middleware for logging all API requests to database (pure ASGI, streaming-safe)"""
     
-    def __init__(self, app, db_service: APIRequestService):
-        super().__init__(app)
-        self.db_service = db_service
+    def __init__(self, app: ASGIApp, request_log_queue: RequestLogQueue):
+        self.app = app
+        self.request_log_queue = request_log_queue
     
-    async def dispatch(self, request: Request, call_next):
-        # Generate request ID
-        request_id = f"req_{uuid.uuid4().hex[:16]}"
-        request.state.request_id = request_id
-        
-        # Extract request data
-        start_time = time.time()
-        
-        # Get client info
-        client_ip = self._get_client_ip(request)
-        user_agent = request.headers.get("user-agent")
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in SKIP_LOGGING_PATHS:
+            await self.app(scope, receive, send)
+            return
         
-        # Get auth info if available
-        auth_user = getattr(request.state, 'auth_user', None)
-        auth_method = getattr(request.state, 'auth_method', None)
+        request = Request(scope, receive)
+        start_ns = time.perf_counter_ns()
+        record = self.start_request(request)
+        request_id = record["request_id"]
         
-        # Get body size if available
-        body_size = None
-        if hasattr(request, '_body'):
-            body_size = len(request._body)
+        # Observe the response as it is sent instead of buffering it
+        status_code = 500
+        response_size = 0
         
-        # Create API request record
-        api_request = APIRequest(
-            request_id=request_id,
-            method=request.method,
-            path=str(request.url.path),
-            headers=dict(request.headers),
-            query_params=dict(request.query_params),
-            body_size=body_size,
-            client_ip=client_ip,
-            user_agent=user_agent,
-            auth_user=auth_user,
-            auth_method=auth_method,
-            target_service=self._extract_target_service(request.url.path)
-        )
-        
-        # Log request start
-        try:
-            await self.db_service.log_request_start(api_request)
-            logger.info("Request started",
-                       request_id=request_id,
-                       method=request.method,
-                       path=str(request.url.path),
-                       client_ip=client_ip)
-        except Exception as e:
-            logger.error("Failed to log request start",
-                        request_id=request_id,
-                        error=str(e))
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
         
         # Process request
         try:
-            response = await call_next(request)
-            
-            # Calculate processing time
-            processing_time = time.time() - start_time
-            
-            # Get response size
-            response_size = None
-            if hasattr(response, 'body'):
-                response_size = len(response.body)
-            
-            # Log request completion
-            try:
-                await self.db_service.complete_request(
-                    request_id=request_id,
-                    status_code=response.status_code,
-                    response_size=response_size,
-                    processing_time=processing_time
-                )
-                
-                logger.info("Request completed",
-                           request_id=request_id,
-                           status_code=response.status_code,
-                           processing_time=f"{processing_time:.3f}s")
-                           
-            except Exception as e:
-                logger.error("Failed to log request completion",
-                            request_id=request_id,
-                            error=str(e))
-            
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Log error
-            processing_time = time.time() - start_time
-            
-            try:
-                await self.db_service.complete_request(
-                    request_id=request_id,
-                    status_code=500,
-                    processing_time=processing_time,
-                    error_message=str(e)
-                )
-            except Exception as log_error:
-                logger.error("Failed to log request error",
-                            request_id=request_id,
-                            error=str(log_error))
-            
-            logger.error("Request failed",
-                        request_id=request_id,
-                        error=str(e),
-                        processing_time=f"{processing_time:.3f}s")
-            
+            self.finish_request(record, request, start_ns, 500, error=e)
             raise
+        
+        self.finish_request(record, request, start_ns, status_code, response_size)
     
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request"""
-        # Check for forwarded headers first
-        forwarded_for = request.headers.get("x-forwarded-for")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
+    def start_request(self, request: Request) -> Dict[str, Any]:
+        """Assign a request ID and build the log record for a new request"""
+        path = request.url.path
+        
+        # Generate request ID
+        request_id = next_request_id()
+        request.state.request_id = request_id
+        
+        # Get client info
+        client_ip = get_client_ip(request)
         
-        real_ip = request.headers.get("x-real-ip")
-        if real_ip:
-            return real_ip
+        # Body size as declared by the client; the body itself is never read here
+        content_length = request.headers.get("content-length")
+        body_size = int(content_length) if content_length and content_length.isdigit() else None
         
-        # Fall back to direct client
-        if hasattr(request, 'client') and request.client:
-            return request.client.host
+        # Request record, written once by the log queue after the response
+        record = {
+            "request_id": request_id,
+            "method": request.method,
+            "path": path,
+            # Raw ASGI values (no copy); decoded by the log queue consumer
+            "headers": request.scope["headers"],
+            "query_string": request.scope["query_string"],
+            "body_size": body_size,
+            "client_ip": client_ip,
+            "service_name": _extract_target_service(path)
+        }
         
-        return "unknown"
+        # The completion line carries the same fields; starts are only traced at debug level
+        logger.debug("Request started",
+                    request_id=request_id,
+                    method=request.method,
+                    path=path,
+                    client_ip=client_ip)
+        
+        return record
     
-    def _extract_target_service(self, path: str) -> str:
-        """Extract target service from request path"""
-        if path.startswith('/api/v1/'):
-            parts = path.split('/')
-            if len(parts) >= 4:
-                return parts[3]  # /api/v1/{service}/...
+    def finish_request(self, record: Dict[str, Any], request: Request, start_ns: int,
+                       status_code: int, response_size: Optional[int] = None,
+                       error: Optional[Exception] = None) -> None:
+        """Complete the request record, hand it to the log queue and log the outcome"""
+        # Calculate processing time on the monotonic clock
+        elapsed_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
         
-        # Default mappings
-        if path.startswith('/task'):
-            return 'task-manager'
-        elif path.startswith('/cluster'):
-            return 'cluster-manager'
-        elif path.startswith('/model'):
-            return 'model-manager'
-        elif path.startswith('/worker'):
-            return 'worker'
+        # Auth info is set by inner middleware while the request is processed
+        record["auth_user"] = getattr(request.state, 'auth_user', None)
+        record["status_code"] = status_code
+        record["response_size"] = response_size
+        record["response_time_ms"] = elapsed_ms
+        if error is not None:
+            record["error_message"] = str(error)
+        self.request_log_queue.submit(record)
         
-        return 'gateway'
+        if error is not None:
+            logger.error("Request failed",
+                        request_id=record["request_id"],
+                        method=record["method"],
+                        path=record["path"],
+                        error=str(error),
+                        processing_time_ms=elapsed_ms)
+        else:
+            logger.info("Request completed",
+                       request_id=record["request_id"],
+                       method=record["method"],
+                       path=record["path"],
+                       status_code=status_code,
+                       processing_time_ms=elapsed_ms)
+
+
+@lru_cache(maxsize=2048)
+def _extract_target_service(path: str) -> str:
+    """Extract target service from request path (cached; routes are a bounded set)"""
+    if path.startswith('/api/v1/'):
+        parts = path.split('/')
+        if len(parts) >= 4:
+            return parts[3]  # /api/v1/{service}/...
+    
+    # Default mappings
+    if path.startswith('/task'):
+        return 'task-manager'
+    elif path.startswith('/cluster'):
+        return 'cluster-manager'
+    elif path.startswith('/model'):
+        return 'model-manager'
+    elif path.startswith('/worker'):
+        return 'worker'
+    
+    return 'gateway'
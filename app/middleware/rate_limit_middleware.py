@@ -2,63 +2,111 @@
 Rate limiting middleware for Gateway Manager
 """
 
-from typing import Dict, Any
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
 from app.models import RateLimitService, SecurityService
+from .client_ip import get_client_ip
+from .incidents import IncidentReporter
 
 logger = structlog.get_logger(__name__)
 
+# Paths exempt from rate limiting
+EXEMPT_PATHS = frozenset({"/health", "/metrics"})
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware for rate limiting API requests"""
+# Blocked identifiers are rejected locally until their window resets
+BLOCKED_CACHE_MAX_SIZE = 100_000
+BLOCKED_CACHE_DEFAULT_TTL_SECONDS = 60.0
+
+
+class RateLimitMiddleware:
+    """Middleware for rate limiting API requests (pure ASGI)"""
     
-    def __init__(self, app, rate_limit_service: RateLimitService, 
+    def __init__(self, app: ASGIApp, rate_limit_service: RateLimitService, 
                  security_service: SecurityService):
-        super().__init__(app)
+        self.app = app
         self.rate_limit_service = rate_limit_service
         self.security_service = security_service
+        self.incidents = IncidentReporter(security_service)
+        
+        # Buckets known to be over their limit: (bucket_type, identifier) -> (expires_at, blocked_result)
+        self._blocked: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope, receive)
+        try:
+            rate_limit_headers = await self.enforce(request)
+        except HTTPException as e:
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+            await response(scope, receive, send)
+            return
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add rate limit headers to response
+                headers = MutableHeaders(scope=message)
+                for name, value in rate_limit_headers.items():
+                    headers[name] = value
+            await send(message)
         
-        # Paths exempt from rate limiting
-        self.exempt_paths = {
-            "/health",
-            "/metrics"
-        }
+        # Process request
+        await self.app(scope, receive, send_wrapper)
     
-    async def dispatch(self, request: Request, call_next):
+    async def enforce(self, request: Request) -> Dict[str, str]:
+        """
+        Check rate limits for the request, raising 429 when one is exceeded.
+        
+        Returns the rate limit headers to add to the response.
+        """
         # Skip rate limiting for exempt paths
-        if request.url.path in self.exempt_paths:
-            return await call_next(request)
+        path = request.url.path
+        if path in EXEMPT_PATHS:
+            return {}
         
         # Get rate limit parameters
-        client_ip = self._get_client_ip(request)
+        client_ip = get_client_ip(request)
         api_key_id = getattr(request.state, 'api_key_id', None)
         custom_limit = getattr(request.state, 'rate_limit', None)
+        bucket_limit = {'requests': custom_limit, 'window': 3600} if custom_limit else None
         
-        # Check rate limits
-        rate_limit_results = []
+        # Buckets to check: IP-based, plus API key-based if authenticated
+        buckets = [("ip", client_ip)]
+        if api_key_id:
+            buckets.append(("api_key", api_key_id))
         
-        # 1. Check IP-based rate limit
-        ip_result = await self.rate_limit_service.check_rate_limit(
-            bucket_type="ip",
-            identifier=client_ip,
-            custom_limit={'requests': custom_limit, 'window': 3600} if custom_limit else None
-        )
-        rate_limit_results.append(('ip', ip_result))
+        # Reject identifiers already known to be over their limit without a service call
+        for bucket in buckets:
+            cached_block = self._cached_block(bucket)
+            if cached_block is not None:
+                raise self._rate_limit_error(cached_block)
         
-        # 2. Check API key-based rate limit if authenticated
-        if api_key_id:
-            key_result = await self.rate_limit_service.check_rate_limit(
-                bucket_type="api_key",
-                identifier=api_key_id,
-                custom_limit={'requests': custom_limit, 'window': 3600} if custom_limit else None
+        # Check rate limits (independent buckets, checked concurrently; results keep bucket order)
+        rate_limit_results = await asyncio.gather(*(
+            self.rate_limit_service.check_rate_limit(
+                bucket_type=bucket_type,
+                identifier=identifier,
+                custom_limit=bucket_limit
             )
-            rate_limit_results.append(('api_key', key_result))
+            for bucket_type, identifier in buckets
+        ))
         
         # Check if any rate limit is exceeded
-        blocked_results = [result for bucket_type, result in rate_limit_results if not result['allowed']]
+        blocked_results = []
+        for bucket, result in zip(buckets, rate_limit_results):
+            if not result['allowed']:
+                self._remember_block(bucket, result)
+                blocked_results.append(result)
         
         if blocked_results:
             # Use the most restrictive limit
@@ -68,77 +116,80 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             logger.warning("Rate limit exceeded",
                           client_ip=client_ip,
                           api_key_id=api_key_id,
-                          path=request.url.path,
+                          path=path,
                           reason=blocked_result['reason'])
             
-            # Create security incident for rate limit violation
-            try:
-                await self.security_service.create_incident(
-                    incident_type="rate_limit_exceeded",
-                    severity="medium",
-                    source_ip=client_ip,
-                    description=f"Rate limit exceeded: {blocked_result['reason']}",
-                    details={
-                        "path": request.url.path,
-                        "method": request.method,
-                        "api_key_id": api_key_id,
-                        "rate_limit_info": blocked_result
-                    },
-                    request_path=request.url.path,
-                    request_method=request.method,
-                    api_key_id=api_key_id
-                )
-            except Exception as e:
-                logger.error("Failed to create rate limit incident", error=str(e))
-            
-            # Return rate limit error
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail={
-                    "error": "Rate limit exceeded",
-                    "message": blocked_result['reason'],
-                    "retry_after": int(blocked_result['reset_time'].timestamp()) if blocked_result.get('reset_time') else None
+            # Create security incident for rate limit violation (written in the background)
+            self.incidents.report(
+                incident_type="rate_limit_exceeded",
+                severity="medium",
+                source_ip=client_ip,
+                description=f"Rate limit exceeded: {blocked_result['reason']}",
+                details={
+                    "path": path,
+                    "method": request.method,
+                    "api_key_id": api_key_id,
+                    "rate_limit_info": blocked_result
                 },
-                headers={
-                    "X-RateLimit-Limit": str(blocked_result.get('request_count', 0)),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int(blocked_result['reset_time'].timestamp())) if blocked_result.get('reset_time') else "",
-                    "Retry-After": str(int((blocked_result['reset_time'] - request.state.start_time).total_seconds())) if blocked_result.get('reset_time') else "3600"
-                }
+                request_path=path,
+                request_method=request.method,
+                api_key_id=api_key_id
             )
+            
+            # Return rate limit error
+            raise self._rate_limit_error(blocked_result)
         
         # Store rate limit info for response headers
-        allowed_result = rate_limit_results[0][1]  # Use first (IP) result for headers
+        allowed_result = rate_limit_results[0]  # Use first (IP) result for headers
         request.state.rate_limit_remaining = allowed_result.get('remaining', 0)
         request.state.rate_limit_reset = allowed_result.get('reset_time')
         
-        # Process request
-        response = await call_next(request)
-        
-        # Add rate limit headers to response
-        if hasattr(request.state, 'rate_limit_remaining'):
-            response.headers["X-RateLimit-Remaining"] = str(request.state.rate_limit_remaining)
-        
-        if hasattr(request.state, 'rate_limit_reset'):
-            reset_time = request.state.rate_limit_reset
-            if reset_time:
-                response.headers["X-RateLimit-Reset"] = str(int(reset_time.timestamp()))
+        headers = {"X-RateLimit-Remaining": str(request.state.rate_limit_remaining)}
+        reset_time = request.state.rate_limit_reset
+        if reset_time:
+            headers["X-RateLimit-Reset"] = str(int(reset_time.timestamp()))
         
-        return response
+        return headers
     
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request"""
-        # Check for forwarded headers first
-        forwarded_for = request.headers.get("x-forwarded-for")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("x-real-ip")
-        if real_ip:
-            return real_ip
-        
-        # Fall back to direct client
-        if hasattr(request, 'client') and request.client:
-            return request.client.host
+    def _cached_block(self, bucket: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Return the cached blocking result for a bucket if its window has not reset"""
+        cached = self._blocked.get(bucket)
+        if cached is None:
+            return None
+        if cached[0] > time.monotonic():
+            return cached[1]
+        del self._blocked[bucket]
+        return None
+    
+    def _remember_block(self, bucket: Tuple[str, str], blocked_result: Dict[str, Any]) -> None:
+        """Cache a blocking result until the bucket's window resets"""
+        reset_time = blocked_result.get('reset_time')
+        if reset_time:
+            ttl = (reset_time - datetime.now(reset_time.tzinfo)).total_seconds()
+        else:
+            ttl = BLOCKED_CACHE_DEFAULT_TTL_SECONDS
+        if ttl <= 0:
+            return
         
-        return "unknown"
+        if len(self._blocked) >= BLOCKED_CACHE_MAX_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._blocked[next(iter(self._blocked))]
+        self._blocked[bucket] = (time.monotonic() + ttl, blocked_result)
+    
+    def _rate_limit_error(self, blocked_result: Dict[str, Any]) -> HTTPException:
+        """Build the 429 response for a blocking rate limit result"""
+        reset_time = blocked_result.get('reset_time')
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "error": "Rate limit exceeded",
+                "message": blocked_result['reason'],
+                "retry_after": int(reset_time.timestamp()) if reset_time else None
+            },
+            headers={
+                "X-RateLimit-Limit": str(blocked_result.get('request_count', 0)),
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(reset_time.timestamp())) if reset_time else "",
+                "Retry-After": str(max(0, int((reset_time - datetime.now(reset_time.tzinfo)).total_seconds()))) if reset_time else "3600"
+            }
+        )
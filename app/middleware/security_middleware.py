@@ -4,21 +4,51 @@ Security monitoring middleware for Gateway Manager
 
 import time
 from typing import Dict, Any
+from urllib.parse import unquote
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import ahocorasick
 import structlog
 
+try:
+    # RE2 matches in linear time regardless of pattern; same API for compile/escape/search
+    import re2 as re
+except ImportError:
+    import re
+
 from app.models import SecurityService
+from .client_ip import get_client_ip
+from .incidents import IncidentReporter
 
 logger = structlog.get_logger(__name__)
 
+# Probe endpoints passed through without security checks
+EXEMPT_PATHS = frozenset({"/health", "/metrics"})
+
+# Error statuses that might indicate attacks, and those that raise an incident
+SUSPICIOUS_ERRORS = {
+    401: "unauthorized_access_attempt",
+    403: "forbidden_access_attempt",
+    404: "resource_probing",
+    405: "method_probing",
+    500: "server_error_trigger"
+}
+INCIDENT_ERROR_CODES = frozenset({401, 403, 500})
+
+# Directory traversal sequences, matched after percent-decoding
+TRAVERSAL_SEQUENCES = ('../', '..\\')
+
+# Attack types reported as high severity (all others are medium)
+HIGH_SEVERITY_ATTACKS = frozenset({'sql_injection', 'command_injection'})
 
-class SecurityMiddleware(BaseHTTPMiddleware):
-    """Middleware for security monitoring and threat detection"""
+
+class SecurityMiddleware:
+    """Middleware for security monitoring and threat detection (pure ASGI)"""
     
-    def __init__(self, app, security_service: SecurityService):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, security_service: SecurityService):
+        self.app = app
         self.security_service = security_service
+        self.incidents = IncidentReporter(security_service)
         
         # Security patterns to monitor
         self.suspicious_patterns = {
@@ -30,46 +60,73 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                 '<script', 'javascript:', 'onload=', 'onerror=',
                 'onclick=', 'onmouseover=', 'alert(', 'document.cookie'
             ],
-            'path_traversal': [
-                '../', '..\\', '..%2f', '..%5c', '%2e%2e%2f', '%2e%2e%5c'
-            ],
             'command_injection': [
                 '; cat', '| cat', '& cat', '; ls', '| ls', '& ls',
                 '; wget', '| wget', '& wget', '; curl', '| curl'
             ]
         }
         
+        # All patterns in one Aho-Corasick automaton: a single pass over the request
+        # finds every category's matches; each match yields (attack_type, pattern, severity)
+        self._pattern_automaton = ahocorasick.Automaton()
+        for attack_type, patterns in self.suspicious_patterns.items():
+            severity = "high" if attack_type in HIGH_SEVERITY_ATTACKS else "medium"
+            for pattern in patterns:
+                self._pattern_automaton.add_word(pattern, (attack_type, pattern, severity))
+        self._pattern_automaton.make_automaton()
+        
         # Blocked user agents (known bots/scanners)
         self.blocked_user_agents = [
             'nikto', 'sqlmap', 'nmap', 'masscan', 'nessus',
             'burpsuite', 'w3af', 'skipfish', 'gobuster'
         ]
+        self._blocked_user_agent_re = re.compile(
+            "(?i)" + "|".join(re.escape(agent) for agent in self.blocked_user_agents)
+        )
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope, receive)
+        
         # Store request start time
-        request.state.start_time = time.time()
+        request.state.start_ns = time.perf_counter_ns()
         
         # Perform security checks
-        await self._check_security_threats(request)
+        await self.check_request(request)
+        
+        # Capture the response status as it is sent
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
         # Process request
-        response = await call_next(request)
+        await self.app(scope, receive, send_wrapper)
         
         # Post-processing security checks
-        await self._post_process_security(request, response)
-        
-        return response
+        await self.check_response(request, status_code)
     
-    async def _check_security_threats(self, request: Request) -> None:
+    async def check_request(self, request: Request) -> None:
         """Check for various security threats in the request"""
-        client_ip = self._get_client_ip(request)
-        user_agent = request.headers.get("user-agent", "").lower()
-        path = str(request.url.path).lower()
-        query_string = str(request.url.query).lower()
-        
-        # Check for blocked user agents
-        if any(blocked in user_agent for blocked in self.blocked_user_agents):
-            await self.security_service.create_incident(
+        # Read each request attribute once
+        client_ip = get_client_ip(request)
+        method = request.method
+        request_path = request.scope["path"]
+        raw_user_agent = request.headers.get("user-agent")
+        # The automaton matches lowercase text; the raw query bytes lowercase as ASCII
+        path = request_path.lower()
+        query_string = request.scope["query_string"].lower().decode("latin-1")
+        
+        # Check for blocked user agents (case-insensitive; lowercased only for the report)
+        if raw_user_agent and self._blocked_user_agent_re.search(raw_user_agent):
+            user_agent = raw_user_agent.lower()
+            self.incidents.report(
                 incident_type="suspicious_activity",
                 severity="high",
                 source_ip=client_ip,
@@ -79,121 +136,111 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                     "path": path,
                     "detection_type": "blocked_user_agent"
                 },
-                user_agent=request.headers.get("user-agent"),
-                request_path=request.url.path,
-                request_method=request.method
+                user_agent=raw_user_agent,
+                request_path=request_path,
+                request_method=method
             )
         
-        # Check for suspicious patterns in path and query
-        full_request = f"{path} {query_string}"
-        
-        for attack_type, patterns in self.suspicious_patterns.items():
-            for pattern in patterns:
-                if pattern in full_request:
-                    await self.security_service.create_incident(
-                        incident_type="suspicious_activity",
-                        severity="high" if attack_type in ['sql_injection', 'command_injection'] else "medium",
-                        source_ip=client_ip,
-                        description=f"Potential {attack_type} attempt detected",
-                        details={
-                            "attack_type": attack_type,
-                            "detected_pattern": pattern,
-                            "path": path,
-                            "query_string": query_string,
-                            "user_agent": user_agent
-                        },
-                        user_agent=request.headers.get("user-agent"),
-                        request_path=request.url.path,
-                        request_method=request.method
-                    )
-                    break  # Only log first match per attack type
+        # Check for suspicious patterns in path and query, scanned separately so
+        # no concatenated copy is built and no match can span the two
+        detected = {}
+        for text in (path, query_string) if query_string else (path,):
+            for _, (attack_type, pattern, severity) in self._pattern_automaton.iter(text):
+                # Only log first match per attack type
+                detected.setdefault(attack_type, (pattern, severity))
+            
+            # Path traversal is checked on the decoded text (twice, to catch double
+            # encoding) rather than as a list of encoded variants
+            # (unquote returns the string unchanged without a '%')
+            if "path_traversal" not in detected:
+                decoded = unquote(unquote(text))
+                for pattern in TRAVERSAL_SEQUENCES:
+                    if pattern in decoded:
+                        detected["path_traversal"] = (pattern, "medium")
+                        break
+        
+        for attack_type, (pattern, severity) in detected.items():
+            self.incidents.report(
+                incident_type="suspicious_activity",
+                severity=severity,
+                source_ip=client_ip,
+                description=f"Potential {attack_type} attempt detected",
+                details={
+                    "attack_type": attack_type,
+                    "detected_pattern": pattern,
+                    "path": path,
+                    "query_string": query_string,
+                    "user_agent": (raw_user_agent or "").lower()
+                },
+                user_agent=raw_user_agent,
+                request_path=request_path,
+                request_method=method
+            )
         
         # Check for general suspicious activity
         await self.security_service.check_suspicious_activity(
             source_ip=client_ip,
-            request_path=request.url.path,
-            user_agent=request.headers.get("user-agent")
+            request_path=request_path,
+            user_agent=raw_user_agent
         )
     
-    async def _post_process_security(self, request: Request, response) -> None:
+    async def check_response(self, request: Request, status_code: int) -> None:
         """Post-process security checks after request completion"""
-        processing_time = time.time() - request.state.start_time
+        processing_time = (time.perf_counter_ns() - request.state.start_ns) / 1e9
         
         # Check for unusually slow responses (potential DoS)
         if processing_time > 30.0:  # 30 seconds
-            client_ip = self._get_client_ip(request)
+            client_ip = get_client_ip(request)
+            path = request.url.path
+            method = request.method
             
-            await self.security_service.create_incident(
+            self.incidents.report(
                 incident_type="suspicious_activity",
                 severity="medium",
                 source_ip=client_ip,
                 description=f"Unusually slow request detected: {processing_time:.2f}s",
                 details={
                     "processing_time": processing_time,
-                    "path": request.url.path,
-                    "method": request.method,
-                    "status_code": response.status_code,
+                    "path": path,
+                    "method": method,
+                    "status_code": status_code,
                     "detection_type": "slow_request"
                 },
                 user_agent=request.headers.get("user-agent"),
-                request_path=request.url.path,
-                request_method=request.method
+                request_path=path,
+                request_method=method
             )
         
         # Check for error responses that might indicate probing
-        if response.status_code >= 400:
-            await self._check_error_patterns(request, response)
+        if status_code >= 400:
+            await self._check_error_patterns(request, status_code)
     
-    async def _check_error_patterns(self, request: Request, response) -> None:
+    async def _check_error_patterns(self, request: Request, status_code: int) -> None:
         """Check for error response patterns that might indicate attacks"""
-        client_ip = self._get_client_ip(request)
-        
         # Check for specific error codes that might indicate attacks
-        suspicious_errors = {
-            401: "unauthorized_access_attempt", 
-            403: "forbidden_access_attempt",
-            404: "resource_probing",
-            405: "method_probing",
-            500: "server_error_trigger"
-        }
-        
-        error_type = suspicious_errors.get(response.status_code)
+        error_type = SUSPICIOUS_ERRORS.get(status_code)
         if error_type:
             # Count recent errors from this IP
             # This would typically check a cache or recent database records
             # For now, we'll create an incident for high-value error codes
             
-            if response.status_code in [401, 403, 500]:
-                await self.security_service.create_incident(
+            if status_code in INCIDENT_ERROR_CODES:
+                client_ip = get_client_ip(request)
+                path = request.url.path
+                method = request.method
+                self.incidents.report(
                     incident_type="suspicious_activity",
                     severity="medium",
                     source_ip=client_ip,
                     description=f"Repeated {error_type} from same IP",
                     details={
                         "error_type": error_type,
-                        "status_code": response.status_code,
-                        "path": request.url.path,
-                        "method": request.method,
+                        "status_code": status_code,
+                        "path": path,
+                        "method": method,
                         "detection_type": "error_pattern"
                     },
                     user_agent=request.headers.get("user-agent"),
-                    request_path=request.url.path,
-                    request_method=request.method
+                    request_path=path,
+                    request_method=method
                 )
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request"""
-        # Check for forwarded headers first
-        forwarded_for = request.headers.get("x-forwarded-for")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("x-real-ip")
-        if real_ip:
-            return real_ip
-        
-        # Fall back to direct client
-        if hasattr(request, 'client') and request.client:
-            return request.client.host
-        
-        return "unknown"
@@ -12,6 +12,7 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query, R
 from typing import Optional, List, Dict, Any
 import structlog
 import asyncio
+import re
 from datetime import datetime
 
 from app.services.model_service import ModelManagementService
@@ -34,15 +35,20 @@ logger = structlog.get_logger(__name__)
 # Create router
 model_router = APIRouter(prefix="/models", tags=["Model Management"])
 
+# Separator for the heartbeat's comma-separated model list (trims whitespace around names)
+_MODELS_SPLIT = re.compile(r"\s*,\s*")
+
 
 def get_model_service(request: Request) -> ModelManagementService:
     """Dependency to get the model service instance from app state."""
-    if not hasattr(request.app.state, 'model_service'):
+    # Single attribute lookup (app.state raises AttributeError through its __getattr__)
+    service = getattr(request.app.state, 'model_service', None)
+    if service is None:
         raise HTTPException(
             status_code=500, 
             detail="Model management service not initialized"
         )
-    return request.app.state.model_service
+    return service
 
 
 # Model Download and Management Endpoints
@@ -284,12 +290,7 @@ async def delete_model(
         
         # Check if model is loaded (if not forcing)
         if not force:
-            cluster_status = await service.get_cluster_status()
-            loaded_models = set()
-            for worker in cluster_status.workers:
-                loaded_models.update(worker.models_loaded)
-            
-            if model_name in loaded_models:
+            if await service.is_model_loaded(model_name):
                 raise HTTPException(
                     status_code=400, 
                     detail=f"Model {model_name} is currently loaded. Use force=true to delete anyway."
@@ -385,7 +386,7 @@ async def worker_heartbeat(
     Workers should call this endpoint regularly to maintain their active status.
     """
     try:        # Parse models list
-        models = [m.strip() for m in models_loaded.split(",") if m.strip()]
+        models = [m for m in _MODELS_SPLIT.split(models_loaded.strip()) if m]
         
         # Register heartbeat
         service.register_worker_heartbeat(
@@ -4,8 +4,9 @@ Model Management API Schemas
 Pydantic schemas for the model management REST API endpoints.
 """
 
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List, Literal
+from typing_extensions import Annotated, TypedDict  # pydantic needs typing_extensions.TypedDict before 3.12
+from pydantic import BaseModel, Field, SkipValidation
 from enum import Enum
 from datetime import datetime
 
@@ -38,22 +39,32 @@ class WorkerStatus(str, Enum):
     ERROR = "error"
 
 
+# Field annotations use the Literal forms: pydantic-core validates them with a
+# direct string lookup. The enums remain for code and query parameters that use
+# their members (a str enum member compares equal to its value).
+ModelTypeLiteral = Literal[
+    "llm", "tts", "stable_diffusion", "image_to_text", "multimodal", "embeddings", "custom"
+]
+ModelStatusLiteral = Literal["available", "downloading", "loading", "error", "deleted"]
+WorkerStatusLiteral = Literal["online", "offline", "maintenance", "error"]
+
+
 # Model Management Request/Response Schemas
 
 class ModelDownloadRequest(BaseModel):
     """Request to download a model from HuggingFace"""
     model_id: str = Field(..., description="HuggingFace model identifier")
-    model_type: Optional[ModelType] = Field(default=None, description="Model type (auto-detected if not provided)")
+    model_type: Optional[ModelTypeLiteral] = Field(default=None, description="Model type (auto-detected if not provided)")
     force_download: bool = Field(default=False, description="Force re-download if model exists")
 
 
 class ModelUploadRequest(BaseModel):
     """Request to register a local model"""
     model_name: str = Field(..., description="Name for the model")
-    model_type: ModelType = Field(..., description="Type of model")
+    model_type: ModelTypeLiteral = Field(..., description="Type of model")
     model_path: str = Field(..., description="Local path to model files")
     description: Optional[str] = Field(default=None, description="Model description")
-    tags: List[str] = Field(default=[], description="Model tags")
+    tags: List[str] = Field(default_factory=list, description="Model tags")
 
 
 class ModelAssignRequest(BaseModel):
@@ -72,14 +83,14 @@ class ModelUnloadRequest(BaseModel):
 class ModelSearchRequest(BaseModel):
     """Request to search HuggingFace models"""
     query: str = Field(..., description="Search query")
-    model_type: Optional[ModelType] = Field(default=None, description="Filter by model type")
+    model_type: Optional[ModelTypeLiteral] = Field(default=None, description="Filter by model type")
     limit: int = Field(default=20, ge=1, le=100, description="Maximum results to return")
 
 
 class ModelListRequest(BaseModel):
     """Request to list local models"""
-    model_type: Optional[ModelType] = Field(default=None, description="Filter by model type")
-    status: Optional[ModelStatus] = Field(default=None, description="Filter by status")
+    model_type: Optional[ModelTypeLiteral] = Field(default=None, description="Filter by model type")
+    status: Optional[ModelStatusLiteral] = Field(default=None, description="Filter by status")
     page: int = Field(default=1, ge=1, description="Page number")
     page_size: int = Field(default=20, ge=1, le=100, description="Items per page")
 
@@ -89,11 +100,11 @@ class ModelListRequest(BaseModel):
 class ModelInfo(BaseModel):
     """Basic model information"""
     model_name: str = Field(..., description="Model name")
-    model_type: ModelType = Field(..., description="Model type")
-    status: ModelStatus = Field(..., description="Current status")
+    model_type: ModelTypeLiteral = Field(..., description="Model type")
+    status: ModelStatusLiteral = Field(..., description="Current status")
     size_gb: Optional[float] = Field(default=None, description="Model size in GB")
     description: Optional[str] = Field(default=None, description="Model description")
-    tags: List[str] = Field(default=[], description="Model tags")
+    tags: List[str] = Field(default_factory=list, description="Model tags")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
@@ -119,10 +130,10 @@ class ModelSearchResult(BaseModel):
     model_id: str = Field(..., description="HuggingFace model ID")
     model_name: str = Field(..., description="Model display name")
     description: Optional[str] = Field(default=None, description="Model description")
-    model_type: Optional[ModelType] = Field(default=None, description="Detected model type")
+    model_type: Optional[ModelTypeLiteral] = Field(default=None, description="Detected model type")
     downloads: Optional[int] = Field(default=None, description="Download count")
     likes: Optional[int] = Field(default=None, description="Number of likes")
-    tags: List[str] = Field(default=[], description="Model tags")
+    tags: List[str] = Field(default_factory=list, description="Model tags")
 
 
 class ModelListResponse(BaseModel):
@@ -134,16 +145,16 @@ class ModelListResponse(BaseModel):
     pages: int = Field(..., description="Total pages")
 
 
-class WorkerInfo(BaseModel):
-    """Worker information"""
-    worker_id: str = Field(..., description="Worker identifier")
-    status: WorkerStatus = Field(..., description="Worker status")
-    gpu_memory_total: float = Field(..., description="Total GPU memory in GB")
-    gpu_memory_used: float = Field(..., description="Used GPU memory in GB")
-    gpu_memory_free: float = Field(..., description="Free GPU memory in GB")
-    models_loaded: List[str] = Field(default=[], description="Currently loaded models")
-    load_score: float = Field(..., description="Current load score")
-    last_seen: datetime = Field(..., description="Last heartbeat timestamp")
+class WorkerInfo(TypedDict):
+    """Worker information (a TypedDict: listed per worker, so validated as a plain dict)"""
+    worker_id: Annotated[str, Field(description="Worker identifier")]
+    status: Annotated[WorkerStatusLiteral, Field(description="Worker status")]
+    gpu_memory_total: Annotated[float, Field(description="Total GPU memory in GB")]
+    gpu_memory_used: Annotated[float, Field(description="Used GPU memory in GB")]
+    gpu_memory_free: Annotated[float, Field(description="Free GPU memory in GB")]
+    models_loaded: Annotated[List[str], Field(description="Currently loaded models")]
+    load_score: Annotated[float, Field(description="Current load score")]
+    last_seen: Annotated[datetime, Field(description="Last heartbeat timestamp")]
 
 
 class ClusterStatusResponse(BaseModel):
@@ -171,12 +182,12 @@ class DownloadProgressResponse(BaseModel):
 
 
 class SystemStatsResponse(BaseModel):
-    """System statistics"""
-    registry_stats: Dict[str, Any] = Field(..., description="Registry statistics")
-    worker_stats: Dict[str, Any] = Field(..., description="Worker statistics")
-    memory_stats: Dict[str, Any] = Field(..., description="Memory usage statistics")
-    model_stats: Dict[str, Any] = Field(..., description="Model statistics")
-    performance_stats: Dict[str, Any] = Field(..., description="Performance metrics")
+    """System statistics (free-form service-built dicts, so their contents are not validated)"""
+    registry_stats: SkipValidation[Dict[str, Any]] = Field(..., description="Registry statistics")
+    worker_stats: SkipValidation[Dict[str, Any]] = Field(..., description="Worker statistics")
+    memory_stats: SkipValidation[Dict[str, Any]] = Field(..., description="Memory usage statistics")
+    model_stats: SkipValidation[Dict[str, Any]] = Field(..., description="Model statistics")
+    performance_stats: SkipValidation[Dict[str, Any]] = Field(..., description="Performance metrics")
 
 
 # Generic Response Schemas
@@ -5,11 +5,14 @@ These routes provide a unified API for cluster management that forwards
 requests to the cluster-manager service.
 """
 
+import asyncio
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional, Dict, Any
 import structlog
 
 from app.core.auth import AUTH_DEPENDENCY
+from app.core.errors import route_errors
 from app.services.service_proxy import service_proxy
 
 logger = structlog.get_logger(__name__)
@@ -23,6 +26,7 @@ integrated_cluster_router = APIRouter(
 
 
 @integrated_cluster_router.get("/")
+@route_errors("Failed to retrieve workers", "Failed to list workers", exc_info=True)
 async def list_workers(
     status: Optional[str] = Query(None),
     limit: Optional[int] = Query(None, ge=1, le=100),
@@ -35,63 +39,65 @@ async def list_workers(
     - **limit**: Maximum number of workers to return
     - **offset**: Number of workers to skip
     """
-    try:
-        params = {}
-        if status is not None:
-            params["status"] = status
-        if limit is not None:
-            params["limit"] = limit
-        if offset is not None:
-            params["offset"] = offset
-            
-        result = await service_proxy.get_workers(**params)
-        
-        logger.info("Workers listed successfully", count=len(result.get("workers", [])))
-        return result
+    # Only forward the filters that were given
+    params = {name: value for name, value in (("status", status), ("limit", limit), ("offset", offset)) if value is not None}
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Failed to list workers", error=str(e), exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to retrieve workers")
+    result = await service_proxy.get_workers(**params)
+    
+    logger.info("Workers listed successfully", count=len(result.get("workers", [])))
+    return ORJSONResponse(result)
+
+
+# Registered before /{worker_id} so the path is not taken as a worker ID
+@integrated_cluster_router.get("/dashboard")
+async def get_cluster_dashboard():
+    """
+    Get workers, cluster status and cluster-manager health in one call
+    
+    The upstream requests run concurrently; a part that fails is reported
+    in place as {"error": ...} instead of failing the whole response.
+    """
+    results = await asyncio.gather(
+        service_proxy.get_workers(),
+        service_proxy.get_cluster_status(),
+        service_proxy.check_service_health("cluster-manager"),
+        return_exceptions=True
+    )
+    
+    dashboard = {}
+    for name, result in zip(("workers", "status", "health"), results):
+        if isinstance(result, Exception):
+            logger.error("Dashboard upstream request failed", part=name, error=str(result))
+            result = {"error": result.detail if isinstance(result, HTTPException) else str(result)}
+        dashboard[name] = result
+    
+    return ORJSONResponse(dashboard)
 
 
 @integrated_cluster_router.get("/{worker_id}")
+@route_errors("Failed to retrieve worker information", "Failed to get worker info", log_params=("worker_id",), exc_info=True)
 async def get_worker(worker_id: str):
     """
     Get detailed information about a specific worker
     
     - **worker_id**: Unique identifier of the worker
     """
-    try:
-        result = await service_proxy.get_worker(worker_id)
-        
-        logger.info("Worker info retrieved", worker_id=worker_id)
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Failed to get worker info", worker_id=worker_id, error=str(e), exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to retrieve worker information")
+    result = await service_proxy.get_worker(worker_id)
+    
+    logger.info("Worker info retrieved", worker_id=worker_id)
+    return ORJSONResponse(result)
 
 
 @integrated_cluster_router.get("/cluster/status")
+@route_errors("Failed to retrieve cluster status", "Failed to get cluster status", exc_info=True)
 async def get_cluster_status():
     """
     Get overall cluster status and statistics from cluster-manager
     """
-    try:
-        result = await service_proxy.get_cluster_status()
-        
-        logger.info("Cluster status retrieved")
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Failed to get cluster status", error=str(e), exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to retrieve cluster status")
+    result = await service_proxy.get_cluster_status()
+    
+    logger.info("Cluster status retrieved")
+    return ORJSONResponse(result)
 
 
 # Health check endpoint for cluster manager
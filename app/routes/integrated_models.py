@@ -6,10 +6,12 @@ requests to the restructured model-manager service.
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, Dict, Any, List
+from fastapi.responses import ORJSONResponse, Response
+from typing import Optional
 import structlog
 
 from app.core.auth import AUTH_DEPENDENCY
+from app.schemas import DownloadModelRequest
 from app.services.service_proxy import service_proxy
 
 logger = structlog.get_logger(__name__)
@@ -36,18 +38,14 @@ async def list_models(
     - **search**: Search term to filter models
     """
     try:
-        params = {}
-        if limit is not None:
-            params["limit"] = limit
-        if offset is not None:
-            params["offset"] = offset
-        if search is not None:
-            params["search"] = search
+        # Only forward the filters that were given
+        params = {name: value for name, value in (("limit", limit), ("offset", offset), ("search", search)) if value is not None}
             
-        result = await service_proxy.get_models(**params)
+        # The listing is passed through as the upstream bytes, without a decode/encode round trip
+        upstream = await service_proxy.get_models_raw(**params)
         
-        logger.info("Models listed successfully", count=len(result.get("models", [])))
-        return result
+        logger.info("Models listed successfully", size=len(upstream.content))
+        return Response(upstream.content, upstream.status_code, media_type=upstream.media_type)
         
     except HTTPException:
         raise
@@ -67,7 +65,7 @@ async def get_model(model_id: str):
         result = await service_proxy.get_model_info(model_id)
         
         logger.info("Model info retrieved", model_id=model_id)
-        return result
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -77,7 +75,7 @@ async def get_model(model_id: str):
 
 
 @integrated_model_router.post("/download")
-async def download_model(model_data: Dict[Any, Any]):
+async def download_model(request: DownloadModelRequest):
     """
     Download a model from HuggingFace Hub via model-manager
     
@@ -86,15 +84,13 @@ async def download_model(model_data: Dict[Any, Any]):
     - **model_type**: Type of model (llm, embedding, etc.)
     - **force_download**: Whether to re-download if exists
     """
+    # Only the fields the client sent are forwarded, as before
+    model_data = request.model_dump(exclude_unset=True)
     try:
-        # Validate required fields
-        if "model_id" not in model_data:
-            raise HTTPException(status_code=400, detail="model_id is required")
-            
         result = await service_proxy.download_model(model_data)
         
-        logger.info("Model download initiated", model_id=model_data.get("model_id"))
-        return result
+        logger.info("Model download initiated", model_id=request.model_id)
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -119,7 +115,7 @@ async def delete_model(model_id: str):
         result = await service_proxy.delete_model(model_id)
         
         logger.info("Model deleted", model_id=model_id)
-        return result
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -6,6 +6,8 @@ BitingLip services.
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 import structlog
 from datetime import datetime
 
@@ -14,6 +16,18 @@ from app.services.service_proxy import service_proxy
 
 logger = structlog.get_logger(__name__)
 
+# The ping body never changes, so it is serialized once at import
+_PING_BYTES = orjson.dumps({
+    "status": "ok",
+    "message": "BitingLip Gateway is running",
+    "service": "gateway"
+})
+
+_UNKNOWN_SERVICES = {
+    service: {"status": "unknown", "error": "Health check failed"}
+    for service in ("model-manager", "task-manager", "cluster-manager")
+}
+
 # Create router for system-wide operations
 integrated_system_router = APIRouter(
     prefix="/api/system",
@@ -55,17 +69,13 @@ async def get_system_health():
         
     except Exception as e:
         logger.error("System health check failed", error=str(e), exc_info=True)
-        return {
+        return ORJSONResponse({
             "overall_status": "error",
             "healthy_services": 0,
-            "total_services": 3,
+            "total_services": len(_UNKNOWN_SERVICES),
             "error": str(e),
-            "services": {
-                "model-manager": {"status": "unknown", "error": "Health check failed"},
-                "task-manager": {"status": "unknown", "error": "Health check failed"},
-                "cluster-manager": {"status": "unknown", "error": "Health check failed"}
-            }
-        }
+            "services": _UNKNOWN_SERVICES
+        })
 
 
 @integrated_system_router.get("/status")
@@ -117,11 +127,7 @@ async def ping():
     """
     Simple ping endpoint for CLI connectivity testing
     """
-    return {
-        "status": "ok",
-        "message": "BitingLip Gateway is running",
-        "service": "gateway"
-    }
+    return Response(_PING_BYTES, media_type="application/json")
 
 
 # API compatibility endpoint for CLI health checks
@@ -145,10 +151,10 @@ async def api_health():
         
     except Exception as e:
         logger.error("API health check failed", error=str(e), exc_info=True)
-        return {
+        return ORJSONResponse({
             "status": "error",
             "timestamp": datetime.utcnow().isoformat(),
             "error": str(e),
             "healthy_services": 0,
             "total_services": 0
-        }
+        })
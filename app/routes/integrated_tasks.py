@@ -6,10 +6,12 @@ requests to the restructured task-manager service.
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, Dict, Any
+from fastapi.responses import ORJSONResponse, Response
+from typing import Optional
 import structlog
 
 from app.core.auth import AUTH_DEPENDENCY
+from app.schemas import TaskSubmitRequest
 from app.services.service_proxy import service_proxy
 
 logger = structlog.get_logger(__name__)
@@ -23,7 +25,7 @@ integrated_task_router = APIRouter(
 
 
 @integrated_task_router.post("/")
-async def submit_task(task_data: Dict[Any, Any]):
+async def submit_task(request: TaskSubmitRequest):
     """
     Submit a new task to the task-manager service
     
@@ -34,22 +36,18 @@ async def submit_task(task_data: Dict[Any, Any]):
     - **priority**: Task priority (optional, 1=highest, 10=lowest)
     - **timeout**: Maximum execution time in seconds (optional)
     """
+    # Only the fields the client sent are forwarded, as before
+    task_data = request.model_dump(exclude_unset=True)
     try:
-        # Validate required fields
-        required_fields = ["task_type", "model_name", "payload"]
-        for field in required_fields:
-            if field not in task_data:
-                raise HTTPException(status_code=400, detail=f"{field} is required")
-                
         result = await service_proxy.submit_task(task_data)
         
         logger.info(
             "Task submitted successfully", 
             task_id=result.get("task_id"),
-            task_type=task_data.get("task_type"),
-            model_name=task_data.get("model_name")
+            task_type=request.task_type,
+            model_name=request.model_name
         )
-        return result
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -77,18 +75,14 @@ async def list_tasks(
     - **offset**: Number of tasks to skip
     """
     try:
-        params = {}
-        if status is not None:
-            params["status"] = status
-        if limit is not None:
-            params["limit"] = limit
-        if offset is not None:
-            params["offset"] = offset
+        # Only forward the filters that were given
+        params = {name: value for name, value in (("status", status), ("limit", limit), ("offset", offset)) if value is not None}
             
-        result = await service_proxy.get_tasks(**params)
+        # The listing is passed through as the upstream bytes, without a decode/encode round trip
+        upstream = await service_proxy.get_tasks_raw(**params)
         
-        logger.info("Tasks listed successfully", count=len(result.get("tasks", [])))
-        return result
+        logger.info("Tasks listed successfully", size=len(upstream.content))
+        return Response(upstream.content, upstream.status_code, media_type=upstream.media_type)
         
     except HTTPException:
         raise
@@ -108,7 +102,7 @@ async def get_task(task_id: str):
         result = await service_proxy.get_task(task_id)
         
         logger.info("Task info retrieved", task_id=task_id)
-        return result
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -128,7 +122,7 @@ async def cancel_task(task_id: str):
         result = await service_proxy.cancel_task(task_id)
         
         logger.info("Task cancelled", task_id=task_id)
-        return result
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -145,7 +139,7 @@ async def get_worker_stats():
         result = await service_proxy.get_worker_stats()
         
         logger.info("Worker stats retrieved")
-        return result
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -161,7 +155,7 @@ async def get_worker_health():
         result = await service_proxy.get_worker_health()
         
         logger.info("Worker health retrieved")
-        return result
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -2,6 +2,7 @@
 Task management routes
 """
 
+import asyncio
 from fastapi import APIRouter, HTTPException, BackgroundTasks, status
 from fastapi.responses import Response
 from datetime import datetime, timezone
@@ -31,7 +32,9 @@ async def submit_task_endpoint(
     - **priority**: Task priority (1=highest, 10=lowest)
     - **timeout**: Maximum execution time in seconds    """
     try:
-        task_id = submit_task(task_request)
+        # The task service uses blocking Redis and Celery clients; its calls run in
+        # a worker thread so they do not stall the event loop
+        task_id = await asyncio.to_thread(submit_task, task_request)
         PENDING_TASKS.inc()
         return TaskResponse(
             task_id=task_id,
@@ -43,7 +46,7 @@ async def submit_task_endpoint(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error("Error submitting task", error=str(e), task_request=task_request.dict(), exc_info=True)
+        logger.error("Error submitting task", error=str(e), task_request=task_request.model_dump(), exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to submit task due to internal error")
 
 
@@ -55,7 +58,7 @@ async def get_task_status_endpoint(task_id: str):
     - **task_id**: Unique task identifier returned from submit endpoint
     """
     try:
-        status_info = get_task_status(task_id)
+        status_info = await asyncio.to_thread(get_task_status, task_id)
         if status_info is None:
             raise HTTPException(status_code=404, detail="Task not found")
         return status_info
@@ -74,7 +77,7 @@ async def get_task_result_endpoint(task_id: str):
     - **task_id**: Unique task identifier
     """
     try:
-        result_info = get_task_result(task_id)
+        result_info = await asyncio.to_thread(get_task_result, task_id)
         if result_info is None:
             raise HTTPException(status_code=404, detail="Task result not found or task not completed")
         return result_info
@@ -93,7 +96,7 @@ async def cancel_task_endpoint(task_id: str, background_tasks: BackgroundTasks):
     - **task_id**: Unique task identifier
     """
     try:
-        success = cancel_task(task_id) 
+        success = await asyncio.to_thread(cancel_task, task_id)
         if not success:
             raise HTTPException(status_code=404, detail="Task not found or could not be cancelled")
         return Response(status_code=status.HTTP_204_NO_CONTENT)
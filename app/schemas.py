@@ -1,5 +1,5 @@
 from typing import Optional, Dict, Any, List, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 from common.models import TaskType, TaskStatus
@@ -50,6 +50,27 @@ class TaskRequest(BaseModel):
     timeout: int = Field(default=300, ge=30, le=1800, description="Task timeout in seconds")
 
 
+class TaskSubmitRequest(BaseModel):
+    """Task submission forwarded to task-manager; its payload is validated there"""
+    # Fields task-manager accepts beyond these are forwarded unchanged
+    model_config = ConfigDict(extra="allow")
+    
+    task_type: str = Field(..., description="Type of task (llm, tts, stable_diffusion, etc.)")
+    model_name: str = Field(..., description="Model to use for inference")
+    payload: Dict[str, Any] = Field(..., description="Task-specific input parameters")
+    priority: Optional[int] = Field(default=None, description="Task priority (1=highest, 10=lowest)")
+    timeout: Optional[int] = Field(default=None, description="Maximum execution time in seconds")
+
+
+class DownloadModelRequest(BaseModel):
+    """Model download forwarded to model-manager"""
+    model_config = ConfigDict(extra="allow")
+    
+    model_id: str = Field(..., description="HuggingFace model identifier")
+    model_type: Optional[str] = Field(default=None, description="Type of model (llm, embedding, etc.)")
+    force_download: bool = Field(default=False, description="Whether to re-download if exists")
+
+
 class TaskResponse(BaseModel):
     """Response for submitted task"""
     task_id: str = Field(..., description="Unique task identifier")
@@ -90,7 +111,7 @@ class ClusterStatus(BaseModel):
     running_tasks: int = Field(..., description="Number of currently running tasks")
     completed_tasks_today: int = Field(..., description="Tasks completed today")
     average_task_time: Optional[float] = Field(default=None, description="Average task execution time")
-    gpu_utilization: List[Dict[str, Any]] = Field(default=[], description="Per-GPU utilization stats")
+    gpu_utilization: List[Dict[str, Any]] = Field(default_factory=list, description="Per-GPU utilization stats")
 
 
 class ErrorResponse(BaseModel):
@@ -13,7 +13,9 @@ from datetime import datetime
 import structlog
 
 # Add the worker app to the path so we can import our model management components
-sys.path.append(str(Path(__file__).parent.parent.parent / "worker"))
+worker_path = str(Path(__file__).parent.parent.parent / "worker")
+if worker_path not in sys.path:
+    sys.path.append(worker_path)
 
 from app.model_schemas import (
     ModelDownloadResponse, ModelAssignResponse, ModelInfo, 
@@ -417,7 +419,7 @@ class ModelManagementService:
             ClusterStatusResponse with complete cluster information
         """
         try:
-            # Convert workers to response format
+            # Convert workers to response format (WorkerInfo is a TypedDict: plain dicts)
             workers_info = []
             for worker_data in self._mock_workers:
                 workers_info.append(WorkerInfo(
@@ -431,13 +433,13 @@ class ModelManagementService:
                     last_seen=worker_data["last_seen"]
                 ))
             
-            total_memory = sum(w.gpu_memory_total for w in workers_info)
-            used_memory = sum(w.gpu_memory_used for w in workers_info)
+            total_memory = sum(w["gpu_memory_total"] for w in workers_info)
+            used_memory = sum(w["gpu_memory_used"] for w in workers_info)
             
             return ClusterStatusResponse(
                 workers=workers_info,
                 total_models=len(self._mock_models),
-                loaded_models=sum(len(w.models_loaded) for w in workers_info),
+                loaded_models=sum(len(w["models_loaded"]) for w in workers_info),
                 total_memory_gb=total_memory,
                 used_memory_gb=used_memory,
                 memory_utilization=used_memory / total_memory * 100 if total_memory > 0 else 0,
@@ -448,6 +450,19 @@ class ModelManagementService:
             logger.error("Failed to get cluster status", error=str(e))
             raise
     
+    async def is_model_loaded(self, model_name: str) -> bool:
+        """
+        Check whether a model is loaded on any worker.
+        
+        Args:
+            model_name: Model to look for
+            
+        Returns:
+            True if at least one worker reports the model as loaded
+        """
+        # Reads worker state directly instead of building a full cluster status
+        return any(model_name in worker["models_loaded"] for worker in self._mock_workers)
+    
     async def get_download_progress(self, download_id: str) -> DownloadProgressResponse:
         """
         Get download progress information.
@@ -0,0 +1,142 @@
+"""
+Request Log Queue - Moves API request logging off the request path
+
+Middleware hands a finished request record to the queue without awaiting;
+a background consumer collects records into batches and writes each batch
+to the api_requests table in a single round-trip. Records carry the raw ASGI
+headers and query string, which are decoded only here, off the request path.
+"""
+
+import asyncio
+import ipaddress
+import json
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Headers persisted with each request; everything else (cookies, credentials) is dropped
+LOGGED_HEADERS = frozenset({
+    b"user-agent", b"x-forwarded-for", b"x-real-ip", b"content-length", b"content-type"
+})
+
+# One row per completed request; start and completion fields are written together
+INSERT_API_REQUESTS_SQL = """
+    INSERT INTO api_requests (
+        request_id, method, path, query_params, headers, body_size, client_ip,
+        user_agent, auth_user, service_name, response_status, response_size,
+        response_time_ms, error_message
+    )
+    VALUES ($1, $2, $3, $4::jsonb, $5::jsonb, $6, $7::inet, $8, $9, $10, $11, $12, $13, $14)
+    ON CONFLICT (request_id) DO NOTHING
+"""
+
+
+class RequestLogQueue:
+    """Bounded queue of request log records drained in batches by a background task"""
+
+    def __init__(
+        self,
+        db_manager,
+        maxsize: int = 10_000,
+        batch_size: int = 200,
+        flush_interval: float = 0.01
+    ):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._consumer: Optional[asyncio.Task] = None
+        self._dropped = 0
+
+    def start(self) -> None:
+        """Start the background consumer"""
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self._consume())
+
+    def submit(self, record: Dict[str, Any]) -> None:
+        """Enqueue a request record; drops it if the queue is full"""
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            if self._dropped % 1000 == 1:
+                logger.warning("Request log queue full, dropping records", dropped=self._dropped)
+
+    async def _consume(self) -> None:
+        """Persist queued records in batches until cancelled"""
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                logger.warning("Failed to persist request logs", batch_size=len(batch), error=str(e))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        """Wait for one record, then collect more until the batch fills or the interval passes"""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Insert a batch of request records with one executemany call"""
+        rows = [self._to_row(record) for record in batch]
+        async with self.db_manager.pool.acquire() as conn:
+            await conn.executemany(INSERT_API_REQUESTS_SQL, rows)
+
+    @staticmethod
+    def _to_row(record: Dict[str, Any]) -> tuple:
+        """Convert a queued record to an api_requests row"""
+        # Headers and query string arrive as raw ASGI scope values
+        headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in record["headers"]
+            if name in LOGGED_HEADERS
+        }
+        query_params = dict(parse_qsl(record["query_string"].decode("latin-1"), keep_blank_values=True))
+        client_ip = record["client_ip"]
+        try:
+            ipaddress.ip_address(client_ip)
+        except ValueError:
+            client_ip = None
+        return (
+            record["request_id"],
+            record["method"],
+            record["path"],
+            json.dumps(query_params),
+            json.dumps(headers),
+            record.get("body_size"),
+            client_ip,
+            headers.get("user-agent"),
+            record.get("auth_user"),
+            record.get("service_name"),
+            record["status_code"],
+            record.get("response_size"),
+            record["response_time_ms"],
+            record.get("error_message")
+        )
+
+    async def stop(self) -> None:
+        """Drain pending records, then stop the consumer"""
+        if self._consumer is None:
+            return
+        await self._queue.join()
+        self._consumer.cancel()
+        try:
+            await self._consumer
+        except asyncio.CancelledError:
+            pass
+        self._consumer = None
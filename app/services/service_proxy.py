@@ -5,9 +5,11 @@ This module handles routing and proxying requests from the gateway
 to the appropriate microservices (model-manager, task-manager, cluster-manager).
 """
 
+import asyncio
+import time
 import httpx
 import structlog
-from typing import Dict, Any, Optional
+from typing import Dict, Any, NamedTuple, Optional, Tuple, Union
 from fastapi import HTTPException
 from datetime import datetime
 
@@ -15,18 +17,47 @@ from app.config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Idempotent upstream reads (cluster state, health) are served from a short-lived
+# cache so dashboard and probe bursts do not each cost an upstream round trip
+RESPONSE_CACHE_TTL_SECONDS = 5.0
+RESPONSE_CACHE_MAX_SIZE = 1024
+
+# Model listings change slowly; the last good listing is served for a while
+# longer if model-manager fails
+MODEL_LIST_CACHE_TTL_SECONDS = 15.0
+STALE_RESPONSE_MAX_AGE_SECONDS = 300.0
+
+
+class RawResponse(NamedTuple):
+    """Successful upstream response body, passed through without decoding"""
+    status_code: int
+    content: bytes
+    media_type: str
+
 
 class ServiceProxy:
     """Proxy for routing requests to BitingLip services"""
     
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # One pooled client for all upstream calls; keep-alive connections are reused
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=200,
+                max_connections=500,
+                keepalive_expiry=30.0
+            ),
+            timeout=httpx.Timeout(30.0, connect=2.0)
+        )
         self.services = {
             "model-manager": settings.model_manager_url,
             "task-manager": settings.task_manager_url,
             "cluster-manager": settings.cluster_manager_url
         }
         
+        # (service, path, params, raw) -> (expires_at, result); in-flight fetches by the same key
+        self._response_cache: Dict[Tuple[Any, ...], Tuple[float, Union[Dict[Any, Any], RawResponse]]] = {}
+        self._inflight: Dict[Tuple[Any, ...], asyncio.Future] = {}
+        
     async def cleanup(self):
         """Cleanup HTTP client"""
         await self.client.aclose()
@@ -36,14 +67,30 @@ class ServiceProxy:
         service: str, 
         method: str, 
         path: str, 
+        cache_ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+        raw: bool = False,
         **kwargs
-    ) -> Dict[Any, Any]:
-        """Make a request to a service and handle errors"""
+    ) -> Union[Dict[Any, Any], RawResponse]:
+        """
+        Make a request to a service and handle errors.
+        
+        With raw, a successful response is returned as a RawResponse instead of
+        decoded JSON. GET results are cached for cache_ttl seconds when given.
+        With stale_ttl, a result up to that many seconds past its expiry is
+        served if the service request fails. Any other method drops the cached
+        results for that service.
+        """
         if service not in self.services:
             raise HTTPException(
                 status_code=500, 
                 detail=f"Unknown service: {service}"
             )
+        
+        if method != "GET":
+            self._invalidate_cache(service)
+        elif cache_ttl:
+            return await self._cached_request(service, path, cache_ttl, stale_ttl, raw, **kwargs)
             
         url = f"{self.services[service]}{path}"
         
@@ -59,6 +106,12 @@ class ServiceProxy:
             response = await self.client.request(method, url, **kwargs)
             response.raise_for_status()
             
+            if raw:
+                return RawResponse(
+                    response.status_code,
+                    response.content,
+                    response.headers.get("content-type", "application/json")
+                )
             return response.json()
             
         except httpx.HTTPStatusError as e:
@@ -86,11 +139,83 @@ class ServiceProxy:
                 detail=f"Service {service} unavailable: {str(e)}"
             )
     
+    async def _cached_request(
+        self,
+        service: str,
+        path: str,
+        cache_ttl: float,
+        stale_ttl: Optional[float],
+        raw: bool,
+        **kwargs
+    ) -> Union[Dict[Any, Any], RawResponse]:
+        """Serve a GET from the response cache, fetching each missing result once"""
+        params = kwargs.get("params")
+        cache_key = (service, path, tuple(sorted(params.items())) if params else (), raw)
+        cached = self._response_cache.get(cache_key)
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
+        # Concurrent misses for the same key wait on one upstream request
+        fetch = self._inflight.get(cache_key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._make_request(service, "GET", path, raw=raw, **kwargs))
+            self._inflight[cache_key] = fetch
+            fetch.add_done_callback(lambda done: self._store_response(cache_key, done, cache_ttl))
+        
+        try:
+            # Shielded so one cancelled caller does not cancel the shared request
+            return await asyncio.shield(fetch)
+        except HTTPException:
+            if stale_ttl and cached is not None and cached[0] + stale_ttl > now:
+                logger.warning("Serving stale response after failed service request",
+                              service=service, path=path)
+                return cached[1]
+            raise
+    
+    def _store_response(self, cache_key: Tuple[Any, ...], fetch: asyncio.Future, cache_ttl: float) -> None:
+        """Cache the result of a finished upstream fetch (failures are not cached)"""
+        # Checked first so a failure is always retrieved, even with no caller left
+        failed = fetch.cancelled() or fetch.exception() is not None
+        # A write to the service while the fetch was in flight makes its result stale,
+        # and the key may already belong to a newer fetch that must stay shared
+        if self._inflight.get(cache_key) is not fetch:
+            return
+        del self._inflight[cache_key]
+        if failed:
+            return
+        
+        self._response_cache.pop(cache_key, None)
+        if len(self._response_cache) >= RESPONSE_CACHE_MAX_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._response_cache[next(iter(self._response_cache))]
+        self._response_cache[cache_key] = (time.monotonic() + cache_ttl, fetch.result())
+    
+    def _invalidate_cache(self, service: str) -> None:
+        """Drop cached responses (and in-flight fetches) from a service after a write to it"""
+        # This also drops the entries kept for the stale fallback: after a write
+        # (e.g. a model download or delete) the old listing is known to be wrong,
+        # so a failed read should surface the error rather than serve it
+        stale = [key for key in self._response_cache if key[0] == service]
+        for key in stale:
+            del self._response_cache[key]
+        in_flight = [key for key in self._inflight if key[0] == service]
+        for key in in_flight:
+            del self._inflight[key]
+    
     # Model Manager proxy methods
     async def get_models(self, **params) -> Dict[Any, Any]:
         """Get available models from model-manager"""
         return await self._make_request(
-            "model-manager", "GET", "/models", params=params
+            "model-manager", "GET", "/models", params=params,
+            cache_ttl=MODEL_LIST_CACHE_TTL_SECONDS, stale_ttl=STALE_RESPONSE_MAX_AGE_SECONDS
+        )
+    
+    async def get_models_raw(self, **params) -> RawResponse:
+        """Get available models from model-manager as the undecoded response body"""
+        return await self._make_request(
+            "model-manager", "GET", "/models", params=params, raw=True,
+            cache_ttl=MODEL_LIST_CACHE_TTL_SECONDS, stale_ttl=STALE_RESPONSE_MAX_AGE_SECONDS
         )
     
     async def download_model(self, model_data: Dict[Any, Any]) -> Dict[Any, Any]:
@@ -136,6 +261,12 @@ class ServiceProxy:
             "task-manager", "GET", "/tasks", params=params
         )
     
+    async def get_tasks_raw(self, **params) -> RawResponse:
+        """Get tasks list from task-manager as the undecoded response body"""
+        return await self._make_request(
+            "task-manager", "GET", "/tasks", params=params, raw=True
+        )
+    
     async def get_worker_stats(self) -> Dict[Any, Any]:
         """Get worker statistics from task-manager"""
         return await self._make_request(
@@ -145,33 +276,39 @@ class ServiceProxy:
     async def get_worker_health(self) -> Dict[Any, Any]:
         """Get worker health from task-manager"""
         return await self._make_request(
-            "task-manager", "GET", "/tasks/workers/health"
+            "task-manager", "GET", "/tasks/workers/health",
+            cache_ttl=RESPONSE_CACHE_TTL_SECONDS
         )
     
     # Cluster Manager proxy methods
     async def get_workers(self, **params) -> Dict[Any, Any]:
         """Get workers from cluster-manager"""
         return await self._make_request(
-            "cluster-manager", "GET", "/workers", params=params
+            "cluster-manager", "GET", "/workers", params=params,
+            cache_ttl=RESPONSE_CACHE_TTL_SECONDS
         )
     
     async def get_worker(self, worker_id: str) -> Dict[Any, Any]:
         """Get specific worker from cluster-manager"""
         return await self._make_request(
-            "cluster-manager", "GET", f"/workers/{worker_id}"
+            "cluster-manager", "GET", f"/workers/{worker_id}",
+            cache_ttl=RESPONSE_CACHE_TTL_SECONDS
         )
     
     async def get_cluster_status(self) -> Dict[Any, Any]:
         """Get cluster status from cluster-manager"""
         return await self._make_request(
-            "cluster-manager", "GET", "/cluster/status"
+            "cluster-manager", "GET", "/cluster/status",
+            cache_ttl=RESPONSE_CACHE_TTL_SECONDS
         )
     
     # Health check methods
     async def check_service_health(self, service: str) -> Dict[str, Any]:
         """Check if a service is healthy"""
         try:
-            result = await self._make_request(service, "GET", "/health")
+            result = await self._make_request(
+                service, "GET", "/health", cache_ttl=RESPONSE_CACHE_TTL_SECONDS
+            )
             return {
                 "service": service,
                 "status": "healthy",
@@ -188,9 +325,11 @@ class ServiceProxy:
     
     async def check_all_services(self) -> Dict[str, Any]:
         """Check health of all services"""
-        results = {}
-        for service in self.services.keys():
-            results[service] = await self.check_service_health(service)
+        # Checks run concurrently; check_service_health never raises
+        health = await asyncio.gather(
+            *(self.check_service_health(service) for service in self.services)
+        )
+        results = dict(zip(self.services, health))
         
         healthy_count = sum(1 for r in results.values() if r["status"] == "healthy")
         
@@ -1,5 +1,6 @@
 from celery import Celery
-from typing import Dict, Any, Optional, cast
+from typing import Dict, Any, Optional, Tuple, cast
+import time
 import uuid
 import redis
 import json
@@ -248,13 +249,31 @@ def cancel_task(task_id: str) -> bool:
         return False
 
 
+# Cluster stats come from Celery broadcast inspection, which blocks for up to a
+# second per call; a result is reused for a few seconds across requests
+CLUSTER_STATS_CACHE_TTL_SECONDS = 5.0
+_cluster_stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
 def get_cluster_stats() -> Dict[str, Any]:
     """
-    Get cluster-wide statistics
+    Get cluster-wide statistics (cached for CLUSTER_STATS_CACHE_TTL_SECONDS)
     
     Returns:
         Dict containing cluster statistics
     """
+    global _cluster_stats_cache
+    cached = _cluster_stats_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    
+    stats = _collect_cluster_stats()
+    _cluster_stats_cache = (time.monotonic() + CLUSTER_STATS_CACHE_TTL_SECONDS, stats)
+    return stats
+
+
+def _collect_cluster_stats() -> Dict[str, Any]:
+    """Query Celery workers for cluster-wide statistics"""
     try:
         # Get active workers
         active_workers = celery_app.control.inspect().active()
@@ -0,0 +1,92 @@
+"""
+Shared test doubles for the gateway services the middleware depends on
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.middleware import auth_middleware
+
+
+class FakeAuthService:
+    """Auth service double that validates keys from an in-memory table"""
+
+    def __init__(self):
+        self.keys = {}
+        self.validate_calls = 0
+
+    def add_key(self, api_key, key_id, expires_at=None):
+        self.keys[api_key] = {"key_id": key_id, "name": key_id, "expires_at": expires_at}
+
+    async def validate_api_key(self, api_key, client_ip, user_agent):
+        self.validate_calls += 1
+        return self.keys.get(api_key)
+
+    async def revoke_api_key(self, key_id, revoked_by):
+        revoked = [key for key, data in self.keys.items() if data["key_id"] == key_id]
+        for key in revoked:
+            del self.keys[key]
+        return bool(revoked)
+
+
+class FakeRateLimitService:
+    """Rate limit service double; identifiers in `blocked` are over their limit"""
+
+    def __init__(self):
+        self.blocked = {}
+        self.calls = 0
+
+    async def check_rate_limit(self, bucket_type, identifier, custom_limit=None):
+        self.calls += 1
+        if identifier in self.blocked:
+            return {"allowed": False, "reason": "limit reached", "reset_time": self.blocked[identifier]}
+        return {"allowed": True, "remaining": 99, "reset_time": None}
+
+
+class FakeSecurityService:
+    """Security service double recording created incidents"""
+
+    def __init__(self):
+        self.incidents = []
+
+    async def check_suspicious_activity(self, source_ip, request_path, user_agent):
+        return None
+
+    async def create_incident(self, **incident):
+        self.incidents.append(incident)
+
+
+class FakeRequestLogQueue:
+    """Request log queue double collecting submitted records"""
+
+    def __init__(self):
+        self.records = []
+
+    def submit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture(autouse=True)
+def clear_key_cache():
+    auth_middleware._key_cache.clear()
+    yield
+    auth_middleware._key_cache.clear()
+
+
+@pytest.fixture
+def auth_service():
+    service = FakeAuthService()
+    service.add_key("secret-key", "key-1")
+    return service
+
+
+@pytest.fixture
+def gateway_services(auth_service):
+    """Stand-in for the app.state attributes the lifespan populates"""
+    return SimpleNamespace(
+        request_log_queue=FakeRequestLogQueue(),
+        auth_service=auth_service,
+        rate_limit_service=FakeRateLimitService(),
+        security_service=FakeSecurityService(),
+    )
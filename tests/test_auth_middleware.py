@@ -0,0 +1,77 @@
+"""
+Tests for the API key validation cache in AuthenticationMiddleware
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.middleware import auth_middleware
+from app.middleware.auth_middleware import AuthenticationMiddleware
+from app.routes.admin import revoke_api_key
+
+
+def make_request(path="/api/models/", api_key="secret-key"):
+    headers = [(b"x-api-key", api_key.encode())] if api_key else []
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": headers,
+        "query_string": b"",
+        "client": ("10.0.0.1", 1234),
+    })
+
+
+@pytest.fixture
+def middleware(auth_service):
+    return AuthenticationMiddleware(app=None, auth_service=auth_service)
+
+
+def test_cache_hit_skips_service(middleware, auth_service):
+    asyncio.run(middleware.authenticate(make_request()))
+    asyncio.run(middleware.authenticate(make_request()))
+    assert auth_service.validate_calls == 1
+
+
+def test_invalid_key_is_not_cached(middleware, auth_service):
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(middleware.authenticate(make_request(api_key="wrong-key")))
+        assert exc.value.status_code == 401
+    assert auth_service.validate_calls == 2
+
+
+def test_expired_cache_entry_revalidates(middleware, auth_service, monkeypatch):
+    asyncio.run(middleware.authenticate(make_request()))
+    now = auth_middleware.time.monotonic()
+    monkeypatch.setattr(auth_middleware.time, "monotonic",
+                        lambda: now + auth_middleware.KEY_CACHE_TTL_SECONDS + 1)
+    asyncio.run(middleware.authenticate(make_request()))
+    assert auth_service.validate_calls == 2
+
+
+def test_revoked_key_is_rejected_on_next_request(middleware, auth_service):
+    asyncio.run(middleware.authenticate(make_request()))
+
+    asyncio.run(revoke_api_key(key_id="key-1", auth_service=auth_service))
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(middleware.authenticate(make_request()))
+    assert exc.value.status_code == 401
+
+
+def test_cache_entry_ends_at_key_expiry(middleware, auth_service):
+    auth_service.add_key("secret-key", "key-1", expires_at=datetime.utcnow() + timedelta(seconds=5))
+    asyncio.run(middleware.authenticate(make_request()))
+    expires_at, _ = next(iter(auth_middleware._key_cache.values()))
+    assert expires_at <= auth_middleware.time.monotonic() + 5
+
+
+def test_expired_key_is_not_cached(middleware, auth_service):
+    auth_service.add_key("secret-key", "key-1", expires_at=datetime.utcnow() - timedelta(seconds=1))
+    asyncio.run(middleware.authenticate(make_request()))
+    assert auth_middleware._key_cache == {}
@@ -0,0 +1,41 @@
+"""
+Tests for the Bearer API key dependency
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core import auth
+
+
+def make_request():
+    return Request({"type": "http", "method": "GET", "path": "/api/models/",
+                    "headers": [], "query_string": b""})
+
+
+@pytest.mark.parametrize("authorization, detail", [
+    (None, auth._MISSING_HEADER_DETAIL),
+    ("Basic abc", auth._INVALID_SCHEME_DETAIL),
+    ("Bearer", auth._MALFORMED_HEADER_DETAIL),
+    ("Bearer wrong", auth._INVALID_KEY_DETAIL),
+])
+def test_each_rejection_raises_a_fresh_exception(monkeypatch, authorization, detail):
+    monkeypatch.setattr(auth, "_API_KEY", "secret")
+    raised = []
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(auth.verify_api_key(make_request(), authorization))
+        raised.append(exc.value)
+
+    assert raised[0] is not raised[1]
+    assert [e.status_code for e in raised] == [401, 401]
+    assert raised[0].detail == detail
+    assert raised[0].headers == {"WWW-Authenticate": "Bearer"}
+
+
+def test_valid_key_passes(monkeypatch):
+    monkeypatch.setattr(auth, "_API_KEY", "secret")
+    assert asyncio.run(auth.verify_api_key(make_request(), "Bearer secret")) == "secret"
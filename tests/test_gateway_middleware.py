@@ -0,0 +1,58 @@
+"""
+Tests for the combined GatewayMiddleware request path
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.combined import GatewayMiddleware
+
+
+@pytest.fixture
+def client(gateway_services):
+    app = FastAPI()
+
+    @app.get("/health")
+    @app.get("/api/health")
+    @app.get("/api/system/ping")
+    @app.get("/api/models/")
+    async def ok():
+        return {"status": "ok"}
+
+    app.add_middleware(GatewayMiddleware, services=gateway_services)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/health", "/api/health", "/api/system/ping"])
+def test_public_paths_pass_without_key(client, gateway_services, path):
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert gateway_services.auth_service.validate_calls == 0
+    assert gateway_services.rate_limit_service.calls == 0
+    assert gateway_services.request_log_queue.records == []
+
+
+def test_protected_path_without_key_is_rejected(client):
+    response = client.get("/api/models/")
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "API key required"}
+
+
+def test_rejection_carries_request_id_and_is_logged(client, gateway_services):
+    response = client.get("/api/models/")
+
+    records = gateway_services.request_log_queue.records
+    assert len(records) == 1
+    assert records[0]["status_code"] == 401
+    assert response.headers["X-Request-ID"] == records[0]["request_id"]
+
+
+def test_protected_path_with_valid_key_passes(client, gateway_services):
+    response = client.get("/api/models/", headers={"X-API-Key": "secret-key"})
+
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Remaining"] == "99"
+    assert gateway_services.request_log_queue.records[0]["auth_user"] == "key-1"
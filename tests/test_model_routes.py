@@ -0,0 +1,128 @@
+"""
+Tests for the model management routes' response schemas
+
+The service results carry a field the schemas do not declare; responses must
+drop it rather than fail validation.
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.model_routes import model_router
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+EXTRA = {"unexpected": "field added by a newer service"}
+
+MODEL = {
+    "model_name": "gpt2", "model_type": "llm", "status": "available", "size_gb": 0.5,
+    "description": "test model", "tags": ["text"], "created_at": NOW, "updated_at": NOW, **EXTRA,
+}
+WORKER = {
+    "worker_id": "worker-1", "status": "online", "gpu_memory_total": 16.0,
+    "gpu_memory_used": 4.0, "gpu_memory_free": 12.0, "models_loaded": ["gpt2"],
+    "load_score": 0.25, "last_seen": NOW, **EXTRA,
+}
+
+
+class FakeModelService:
+    """Model service double returning service-shaped results with an extra field"""
+
+    async def download_model(self, model_id, model_type, force_download):
+        return {"model_name": model_id, "status": "started", "download_id": "dl-1",
+                "message": "Download started", **EXTRA}
+
+    async def get_download_progress(self, download_id):
+        return {"download_id": download_id, "model_name": "gpt2", "status": "downloading",
+                "progress_percent": 50.0, **EXTRA}
+
+    async def assign_model(self, model_name, worker_id, force):
+        return {"model_name": model_name, "worker_id": "worker-1", "status": "assigned",
+                "message": "Model assigned", **EXTRA}
+
+    async def unload_model(self, model_name, worker_id=None):
+        return {"message": "Model unloaded", **EXTRA}
+
+    async def list_models(self, model_type, status, page, page_size):
+        return {"models": [MODEL], "total": 1, "page": page, "page_size": page_size,
+                "pages": 1, **EXTRA}
+
+    async def list_workers(self):
+        return [WORKER]
+
+    async def get_model(self, model_name):
+        return MODEL if model_name == "gpt2" else None
+
+    async def is_model_loaded(self, model_name):
+        return False
+
+    async def delete_model(self, model_name):
+        return True
+
+    async def search_huggingface_models(self, query, model_type, limit):
+        return [{"model_id": "org/gpt2", "model_name": "gpt2", "downloads": 10, **EXTRA}]
+
+    async def get_cluster_status(self):
+        return {"workers": [WORKER], "total_models": 1, "loaded_models": 1,
+                "total_memory_gb": 16.0, "used_memory_gb": 4.0, "memory_utilization": 25.0,
+                "active_downloads": 0, **EXTRA}
+
+    async def get_system_statistics(self):
+        return {"registry_stats": {}, "worker_stats": {}, "memory_stats": {},
+                "model_stats": {}, "performance_stats": {}, **EXTRA}
+
+    def register_worker_heartbeat(self, worker_id, gpu_memory_total, gpu_memory_used, models_loaded):
+        return None
+
+    async def rebalance_cluster(self):
+        return None
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(model_router)
+    app.state.model_service = FakeModelService()
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("method, path, body, expected", [
+    ("POST", "/models/download", {"model_id": "gpt2"}, {"download_id": "dl-1"}),
+    ("GET", "/models/download/dl-1/progress", None, {"progress_percent": 50.0}),
+    ("POST", "/models/assign", {"model_name": "gpt2"}, {"worker_id": "worker-1"}),
+    ("POST", "/models/unload", {"model_name": "gpt2"}, {"success": True, "message": "Model unloaded"}),
+    ("GET", "/models/", None, {"total": 1}),
+    ("GET", "/models/gpt2", None, {"model_name": "gpt2"}),
+    ("DELETE", "/models/gpt2", None, {"message": "Model gpt2 deleted successfully"}),
+    ("GET", "/models/cluster/status", None, {"loaded_models": 1}),
+    ("GET", "/models/cluster/statistics", None, {"registry_stats": {}}),
+    ("POST", "/models/workers/worker-1/heartbeat?gpu_memory_total=16&gpu_memory_used=4&models_loaded=gpt2",
+     None, {"success": True}),
+    ("POST", "/models/cluster/rebalance", None, {"message": "Cluster rebalancing completed"}),
+])
+def test_route_ignores_undeclared_fields(client, method, path, body, expected):
+    response = client.request(method, path, json=body)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert expected.items() <= data.items()
+    assert "unexpected" not in data
+
+
+@pytest.mark.parametrize("path", ["/models/workers", "/models/search/huggingface?query=gpt2"])
+def test_list_route_ignores_undeclared_fields(client, path):
+    response = client.get(path)
+
+    assert response.status_code == 200
+    items = response.json()
+    assert len(items) == 1
+    assert "unexpected" not in items[0]
+
+
+def test_list_models_drops_undeclared_model_fields(client):
+    response = client.get("/models/")
+
+    assert response.status_code == 200
+    assert "unexpected" not in response.json()["models"][0]
@@ -0,0 +1,96 @@
+"""
+Tests for the blocked-identifier cache in RateLimitMiddleware
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.middleware import rate_limit_middleware
+from app.middleware.rate_limit_middleware import RateLimitMiddleware
+
+CLIENT_IP = "10.0.0.1"
+
+
+def make_request():
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/models/",
+        "headers": [],
+        "query_string": b"",
+        "client": (CLIENT_IP, 1234),
+    })
+
+
+@pytest.fixture
+def rate_limit_service(gateway_services):
+    return gateway_services.rate_limit_service
+
+
+@pytest.fixture
+def middleware(gateway_services):
+    return RateLimitMiddleware(app=None, rate_limit_service=gateway_services.rate_limit_service,
+                               security_service=gateway_services.security_service)
+
+
+def enforce(middleware):
+    """Run enforce inside a loop; incident reports are scheduled as tasks"""
+    async def run():
+        try:
+            return await middleware.enforce(make_request())
+        finally:
+            await asyncio.sleep(0)
+    return asyncio.run(run())
+
+
+def test_allowed_identifier_is_checked_every_request(middleware, rate_limit_service):
+    assert enforce(middleware) == {"X-RateLimit-Remaining": "99"}
+    assert enforce(middleware) == {"X-RateLimit-Remaining": "99"}
+    assert rate_limit_service.calls == 2
+
+
+def test_blocked_identifier_is_rejected_without_service_call(middleware, rate_limit_service):
+    rate_limit_service.blocked[CLIENT_IP] = datetime.now(timezone.utc) + timedelta(minutes=5)
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as exc:
+            enforce(middleware)
+        assert exc.value.status_code == 429
+    assert rate_limit_service.calls == 1
+
+
+def test_block_expires_at_window_reset(middleware, rate_limit_service, monkeypatch):
+    rate_limit_service.blocked[CLIENT_IP] = datetime.now(timezone.utc) + timedelta(seconds=30)
+    with pytest.raises(HTTPException):
+        enforce(middleware)
+
+    # Window has reset: the service is consulted again and the stale block is dropped
+    del rate_limit_service.blocked[CLIENT_IP]
+    now = rate_limit_middleware.time.monotonic()
+    monkeypatch.setattr(rate_limit_middleware.time, "monotonic", lambda: now + 31)
+
+    assert enforce(middleware) == {"X-RateLimit-Remaining": "99"}
+    assert rate_limit_service.calls == 2
+    assert middleware._blocked == {}
+
+
+def test_past_reset_time_is_not_cached(middleware, rate_limit_service):
+    rate_limit_service.blocked[CLIENT_IP] = datetime.now(timezone.utc) - timedelta(seconds=1)
+    with pytest.raises(HTTPException):
+        enforce(middleware)
+
+    assert middleware._blocked == {}
+
+
+def test_block_without_reset_time_uses_default_ttl(middleware, rate_limit_service):
+    rate_limit_service.blocked[CLIENT_IP] = None
+    with pytest.raises(HTTPException):
+        enforce(middleware)
+
+    expires_at, _ = middleware._blocked[("ip", CLIENT_IP)]
+    remaining = expires_at - rate_limit_middleware.time.monotonic()
+    assert 0 < remaining <= rate_limit_middleware.BLOCKED_CACHE_DEFAULT_TTL_SECONDS
@@ -0,0 +1,116 @@
+"""
+Tests for the background request log queue
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from app.services.request_log_queue import INSERT_API_REQUESTS_SQL, RequestLogQueue
+
+
+class FakeConnection:
+    def __init__(self, batches, fail=False):
+        self.batches = batches
+        self.fail = fail
+
+    async def executemany(self, sql, rows):
+        assert sql == INSERT_API_REQUESTS_SQL
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        self.batches.append(rows)
+
+
+def make_db_manager(fail=False):
+    batches = []
+
+    @asynccontextmanager
+    async def acquire():
+        yield FakeConnection(batches, fail)
+
+    return SimpleNamespace(pool=SimpleNamespace(acquire=acquire), batches=batches)
+
+
+def make_record(index=0, **overrides):
+    record = {
+        "request_id": f"req-{index}",
+        "method": "GET",
+        "path": "/api/models/",
+        "query_string": b"page=2&q=",
+        "headers": [(b"user-agent", b"pytest"), (b"authorization", b"Bearer secret"),
+                    (b"cookie", b"session=1")],
+        "client_ip": "10.0.0.1",
+        "status_code": 200,
+        "response_time_ms": 1.5,
+    }
+    record.update(overrides)
+    return record
+
+
+def test_records_are_written_in_one_batch():
+    async def scenario():
+        db_manager = make_db_manager()
+        queue = RequestLogQueue(db_manager, batch_size=10, flush_interval=0.05)
+        for index in range(3):
+            queue.submit(make_record(index))
+        queue.start()
+        await queue.stop()
+        return db_manager.batches
+
+    batches = asyncio.run(scenario())
+    assert len(batches) == 1
+    assert [row[0] for row in batches[0]] == ["req-0", "req-1", "req-2"]
+
+
+def test_batches_are_capped_at_batch_size():
+    async def scenario():
+        db_manager = make_db_manager()
+        queue = RequestLogQueue(db_manager, batch_size=2, flush_interval=0.05)
+        for index in range(5):
+            queue.submit(make_record(index))
+        queue.start()
+        await queue.stop()
+        return db_manager.batches
+
+    assert [len(batch) for batch in asyncio.run(scenario())] == [2, 2, 1]
+
+
+def test_full_queue_drops_records():
+    async def scenario():
+        db_manager = make_db_manager()
+        queue = RequestLogQueue(db_manager, maxsize=2)
+        for index in range(4):
+            queue.submit(make_record(index))
+        queue.start()
+        await queue.stop()
+        return queue, db_manager.batches
+
+    queue, batches = asyncio.run(scenario())
+    assert queue._dropped == 2
+    assert [row[0] for batch in batches for row in batch] == ["req-0", "req-1"]
+
+
+def test_failed_write_does_not_stop_the_consumer():
+    async def scenario():
+        db_manager = make_db_manager(fail=True)
+        queue = RequestLogQueue(db_manager)
+        queue.start()
+        queue.submit(make_record())
+        # stop() only returns once the failed batch is marked done
+        await asyncio.wait_for(queue.stop(), timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_row_keeps_only_logged_headers():
+    row = RequestLogQueue._to_row(make_record())
+
+    assert json.loads(row[4]) == {"user-agent": "pytest"}
+    assert json.loads(row[3]) == {"page": "2", "q": ""}
+    assert row[7] == "pytest"
+
+
+def test_row_drops_invalid_client_ip():
+    assert RequestLogQueue._to_row(make_record(client_ip="unknown"))[6] is None
+    assert RequestLogQueue._to_row(make_record(client_ip="::1"))[6] == "::1"
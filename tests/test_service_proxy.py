@@ -0,0 +1,147 @@
+"""
+Tests for the ServiceProxy response cache and in-flight request sharing
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.services import service_proxy as service_proxy_module
+from app.services.service_proxy import ServiceProxy
+
+
+class Upstream:
+    """
+    Mock model-manager: each GET /models waits for its own gate, then answers
+    with the next queued status code
+    """
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.gets = 0
+        self.gates = [asyncio.Event() for _ in statuses]
+
+    def open_all(self):
+        for gate in self.gates:
+            gate.set()
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return httpx.Response(200, json={"status": "ok"})
+        index = self.gets
+        self.gets += 1
+        await self.gates[index].wait()
+        status = self.statuses[index]
+        return httpx.Response(status, json={"models": [], "call": index})
+
+
+def make_proxy(upstream: Upstream) -> ServiceProxy:
+    proxy = ServiceProxy()
+    proxy.client = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler))
+    return proxy
+
+
+async def settle():
+    """Let scheduled fetches and done callbacks run"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_callers_share_one_fetch():
+    async def scenario():
+        upstream = Upstream(200)
+        proxy = make_proxy(upstream)
+        waiters = [asyncio.ensure_future(proxy.get_models()) for _ in range(5)]
+        await settle()
+        upstream.open_all()
+        results = await asyncio.gather(*waiters)
+
+        assert upstream.gets == 1
+        assert all(result == {"models": [], "call": 0} for result in results)
+
+        # Served from the cache afterwards
+        assert await proxy.get_models() == {"models": [], "call": 0}
+        assert upstream.gets == 1
+
+    asyncio.run(scenario())
+
+
+def test_failure_is_not_cached():
+    async def scenario():
+        upstream = Upstream(500, 200)
+        upstream.open_all()
+        proxy = make_proxy(upstream)
+
+        with pytest.raises(HTTPException) as exc:
+            await proxy.get_models()
+        assert exc.value.status_code == 500
+
+        assert await proxy.get_models() == {"models": [], "call": 1}
+        assert upstream.gets == 2
+
+    asyncio.run(scenario())
+
+
+def test_invalidation_during_fetch_keeps_newer_fetch_shared():
+    async def scenario():
+        upstream = Upstream(500, 200)
+        proxy = make_proxy(upstream)
+
+        old = asyncio.ensure_future(proxy.get_models())
+        await settle()
+        # A write drops the in-flight read; the next read starts a new fetch
+        await proxy.download_model({"model_id": "m"})
+        new = asyncio.ensure_future(proxy.get_models())
+        await settle()
+
+        # The old fetch failing must not evict the newer in-flight fetch
+        upstream.gates[0].set()
+        with pytest.raises(HTTPException):
+            await old
+        joined = asyncio.ensure_future(proxy.get_models())
+        await settle()
+
+        upstream.gates[1].set()
+        assert await new == await joined == {"models": [], "call": 1}
+        assert upstream.gets == 2
+
+    asyncio.run(scenario())
+
+
+def test_stale_entry_served_when_upstream_fails(monkeypatch):
+    async def scenario():
+        upstream = Upstream(200, 503)
+        upstream.open_all()
+        proxy = make_proxy(upstream)
+        assert await proxy.get_models() == {"models": [], "call": 0}
+
+        # Past the fresh TTL but within the stale window
+        now = service_proxy_module.time.monotonic()
+        monkeypatch.setattr(service_proxy_module.time, "monotonic",
+                            lambda: now + service_proxy_module.MODEL_LIST_CACHE_TTL_SECONDS + 1)
+
+        assert await proxy.get_models() == {"models": [], "call": 0}
+        assert upstream.gets == 2
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_shared_fetch():
+    async def scenario():
+        upstream = Upstream(200)
+        proxy = make_proxy(upstream)
+        cancelled = asyncio.ensure_future(proxy.get_models())
+        waiting = asyncio.ensure_future(proxy.get_models())
+        await settle()
+
+        cancelled.cancel()
+        await settle()
+        upstream.open_all()
+
+        assert await waiting == {"models": [], "call": 0}
+        assert cancelled.cancelled()
+        assert upstream.gets == 1
+
+    asyncio.run(scenario())